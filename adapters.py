@@ -3,36 +3,173 @@
 Source adapter module for the Job Aggregation Agent.
 Defines abstract and concrete adapters for different data sources (e.g., WhatsApp channels).
 Supports modular extension to new sources without altering core aggregation logic.
-For scalability: Adapters follow the Adapter pattern, allowing easy addition of parallel fetchers
-(e.g., using asyncio for concurrent scraping) or integration with cloud services (e.g., AWS Lambda for on-demand scraping).
+For scalability: Adapters follow the Adapter pattern, and fetch_all scrapes every source concurrently
+on one asyncio event loop; sources could also be offloaded to cloud services (e.g., AWS Lambda for on-demand scraping).
 """
 
+import asyncio
+import atexit
+import contextlib
+import json
 import os
-import time
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-import requests
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
+import nodriver as uc
 
-from config import CHROME_DRIVER_PATH, CHROME_PROFILE_DIR, DEBUG_DIR
-from extractors import HTMLMessageExtractor
+from config import (
+    CHROME_HEADLESS, CHROME_PROFILE_DIR, CHROME_REMOTE_HOST, CHROME_REMOTE_PORT,
+    DEBUG_DIR, ENABLED_WHATSAPP_CHANNELS, SAVE_DEBUG_HTML, SCROLL_MAX_STEPS, SCROLL_QUIET_MS, SCROLL_WAIT_MS,
+)
+from extractors import COPYABLE_TEXT_SELECTOR, LEGACY_MESSAGE_SELECTOR, MESSAGE_SELECTOR, HTMLMessageExtractor
+
+WHATSAPP_WEB_URL = "https://web.whatsapp.com"
+
+# Selectors are fused into single CSS selector lists so each probe costs one CDP query
+QR_CODE_SELECTOR = "canvas[aria-label='Scan me!']"
+LOGGED_IN_SELECTOR = "#side"
+CHAT_LIST_SELECTOR = "[data-testid='chat-list']"
+LOGIN_PROBE_SELECTOR = f"{QR_CODE_SELECTOR}, {LOGGED_IN_SELECTOR}, {CHAT_LIST_SELECTOR}"
+VIEW_CHANNEL_SELECTOR = "a._9vcv._advm, a:has(> span._advp), button:has(> span._advp)"
+MESSAGES_PANE_SELECTOR = "[data-testid='conversation-panel-messages']"
+MESSAGE_ROW_SELECTOR = "[data-pre-plain-text], [role='row']"
+
+# Resolves with the lowercase tag name of the first element matching selector, or null after timeoutMs.
+# Runs as one awaited Runtime.evaluate driven by a MutationObserver, instead of nodriver's select()
+# which re-fetches the whole DOM tree over CDP on every poll.
+WAIT_FOR_SELECTOR_JS = """
+(async (selector, timeoutMs) => {
+    const match = () => {
+        const el = document.querySelector(selector);
+        return el ? el.tagName.toLowerCase() : null;
+    };
+    const found = match();
+    if (found) {
+        return found;
+    }
+    return await new Promise(resolve => {
+        const observer = new MutationObserver(() => {
+            const tag = match();
+            if (tag) {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(tag);
+            }
+        });
+        const timer = setTimeout(() => {
+            observer.disconnect();
+            resolve(null);
+        }, timeoutMs);
+        observer.observe(document, {childList: true, subtree: true});
+    });
+})(%s, %d)
+"""
+
+# Finds the "View channel" button (by class, falling back to its label), scrolls it into view and
+# clicks it in one Runtime.evaluate instead of separate select/find/scroll/click CDP round trips
+CLICK_VIEW_CHANNEL_JS = """
+((selector, label) => {
+    const button = document.querySelector(selector) ||
+        [...document.querySelectorAll("a, button, [role='button']")]
+            .find(el => el.textContent.trim() === label);
+    if (!button) {
+        return false;
+    }
+    button.scrollIntoView({block: "center"});
+    button.click();
+    return true;
+})(%s, %s)
+"""
+
+# Scrolls the pane to the top until its height stops growing, entirely inside the page,
+# so the whole history load is a single Runtime.evaluate call instead of a Python-side loop.
+# After each scroll it waits up to waitMs for WhatsApp to start inserting older messages, then
+# returns as soon as the pane has been quiet for quietMs rather than sleeping a fixed interval.
+SCROLL_TO_TOP_JS = """
+(async (selector, maxScrolls, waitMs, quietMs) => {
+    const pane = document.querySelector(selector);
+    const settle = () => new Promise(resolve => {
+        let quiet = null;
+        const done = () => {
+            observer.disconnect();
+            clearTimeout(quiet);
+            clearTimeout(first);
+            clearTimeout(cap);
+            resolve();
+        };
+        const observer = new MutationObserver(() => {
+            clearTimeout(first);
+            clearTimeout(quiet);
+            quiet = setTimeout(done, quietMs);
+        });
+        observer.observe(pane, {childList: true, subtree: true});
+        const first = setTimeout(done, waitMs);
+        const cap = setTimeout(done, waitMs * 5);
+    });
+    let height = pane.scrollHeight;
+    for (let i = 0; i < maxScrolls; i++) {
+        pane.scrollTop = 0;
+        await settle();
+        if (pane.scrollHeight === height) {
+            return {scrolls: i + 1, reachedTop: true};
+        }
+        height = pane.scrollHeight;
+    }
+    return {scrolls: maxScrolls, reachedTop: false};
+})(%s, %d, %d, %d)
+"""
+
+# Collects [pre-plain attribute, visible text] for every message container under the pane in one
+# Runtime.evaluate, so only the message strings cross CDP instead of the serialized pane HTML.
+# Selectors are tried in order like HTMLMessageExtractor, and the text is built the same way:
+# each non-empty trimmed text node, joined by single spaces.
+EXTRACT_MESSAGES_JS = """
+((paneSelector, selectors) => {
+    const pane = document.querySelector(paneSelector) || document;
+    let elems = [];
+    for (const selector of selectors) {
+        elems = pane.querySelectorAll(selector);
+        if (elems.length) {
+            break;
+        }
+    }
+    return Array.from(elems, el => {
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        const texts = [];
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            const text = node.data.trim();
+            if (text) {
+                texts.push(text);
+            }
+        }
+        const pre = el.getAttribute("data-pre-plain-text") || el.getAttribute("data-pre_plain_text");
+        return [pre, texts.join(" ")];
+    });
+})(%s, %s)
+"""
+MESSAGE_SELECTORS = [MESSAGE_SELECTOR, LEGACY_MESSAGE_SELECTOR, COPYABLE_TEXT_SELECTOR]
+
+
+# Media we never parse; blocked per tab so only the text DOM is downloaded.
+# Stylesheets are kept: the message pane only scrolls (and lazy-loads history) with its CSS applied.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.mp4", "*.mp3", "*.ogg", "*.woff", "*.woff2",
+]
+
+# Maximum number of channel tabs scraped at the same time (WhatsApp Web rate-limits aggressive clients)
+MAX_CONCURRENT_CHANNELS = 3
 
 class SourceAdapter(ABC):
     """
     Abstract base class for data sources.
-    Ensures all adapters provide a consistent fetch_posts interface.
+    Ensures all adapters provide a consistent fetch_posts coroutine interface.
     """
     
     def __init__(self, source_name: str):
         self.source_name = source_name
     
     @abstractmethod
-    def fetch_posts(self) -> List[Dict]:
+    async def fetch_posts(self) -> List[Dict]:
         """
         Fetch messages as {text, timestamp} dicts.
         
@@ -41,148 +178,365 @@ class SourceAdapter(ABC):
         """
         pass
 
+async def start_browser(user_data_dir: str = CHROME_PROFILE_DIR) -> uc.Browser:
+    """
+    Launch Chrome with the persistent WhatsApp profile, or attach to the remote Chrome
+    at CHROME_REMOTE_HOST when one is configured.
+    
+    Args:
+        user_data_dir: Chrome profile directory holding the WhatsApp Web session (local Chrome only).
+    
+    Returns:
+        Started nodriver Browser.
+    """
+    if CHROME_REMOTE_HOST:
+        print(f"Connecting to remote Chrome at {CHROME_REMOTE_HOST}:{CHROME_REMOTE_PORT}")
+        return await uc.start(host=CHROME_REMOTE_HOST, port=CHROME_REMOTE_PORT)
+    
+    return await uc.start(
+        user_data_dir=user_data_dir,
+        headless=CHROME_HEADLESS,
+        sandbox=False,
+        browser_args=[
+            "--profile-directory=Default",
+            "--disable-dev-shm-usage",
+            "--start-maximized",
+            "--blink-settings=imagesEnabled=false",
+            "--disable-gpu",
+            "--disable-extensions",
+            # Cast discovery and optimization-guide fetches are background traffic we never use
+            "--disable-features=MediaRouter,OptimizationHints",
+            "--autoplay-policy=user-gesture-required",
+        ],
+    )
+
+# Chrome process shared by every adapter and aggregation run until the interpreter exits
+_BROWSER: Optional[uc.Browser] = None
+_BROWSER_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+def _browser_alive(browser: Optional[uc.Browser]) -> bool:
+    """
+    Check whether a browser can still be driven.
+    
+    Args:
+        browser: Browser to check, or None.
+    
+    Returns:
+        True if the local Chrome process is running, or the remote CDP connection is open.
+    """
+    if browser is None:
+        return False
+    if CHROME_REMOTE_HOST:
+        # nodriver has no process handle for a browser it attached to, so check the socket instead
+        return browser.connection is not None and not browser.connection.closed
+    return not browser.stopped
+
+async def get_browser(user_data_dir: str = CHROME_PROFILE_DIR) -> uc.Browser:
+    """
+    Return the shared Chrome instance, launching it on first use.
+    The CDP connection is bound to the event loop that opened it, so Chrome is relaunched
+    if it has exited or is requested from a different loop.
+    
+    Args:
+        user_data_dir: Chrome profile directory used when a new browser has to be launched.
+    
+    Returns:
+        Running nodriver Browser.
+    """
+    global _BROWSER, _BROWSER_LOOP
+    loop = asyncio.get_running_loop()
+    
+    if not _browser_alive(_BROWSER) or _BROWSER_LOOP is not loop:
+        stop_browser()
+        _BROWSER = await start_browser(user_data_dir)
+        _BROWSER_LOOP = loop
+    
+    return _BROWSER
+
+def stop_browser():
+    """Shut down the shared Chrome instance if one is running."""
+    global _BROWSER, _BROWSER_LOOP
+    if _browser_alive(_BROWSER):
+        # For a remote Chrome this only drops the CDP connection; the browser keeps running
+        _BROWSER.stop()
+        print("Browser closed")
+    _BROWSER = None
+    _BROWSER_LOOP = None
+
+atexit.register(stop_browser)
+
+async def open_tab(browser: uc.Browser, url: str, new_tab: bool = False) -> uc.Tab:
+    """
+    Navigate to a URL with media requests blocked before the page starts loading.
+    
+    Args:
+        browser: Started nodriver Browser.
+        url: Page to open.
+        new_tab: Open the page in a new tab instead of reusing the first one.
+    
+    Returns:
+        Tab showing the page.
+    """
+    tab = await browser.get("about:blank", new_tab=new_tab)
+    await tab.send(uc.cdp.network.enable())
+    await tab.send(uc.cdp.network.set_blocked_ur_ls(urls=BLOCKED_URL_PATTERNS))
+    return await tab.get(url)
+
+async def evaluate_js(tab: uc.Tab, expression: str, await_promise: bool = False):
+    """
+    Run a JavaScript expression in the page and return its result as a plain Python value.
+    Sends Runtime.evaluate itself because Tab.evaluate differs between nodriver releases
+    (newer ones return RemoteObjects for null/false results and return script errors instead
+    of raising), so every in-page call goes through here.
+    
+    Args:
+        tab: Tab to evaluate in.
+        expression: JavaScript expression; its result must be JSON-serializable.
+        await_promise: Wait for a returned promise and use its resolved value.
+    
+    Returns:
+        The result by value (None for null or undefined).
+    
+    Raises:
+        RuntimeError: If the script threw or its promise rejected.
+    """
+    remote_object, errors = await tab.send(uc.cdp.runtime.evaluate(
+        expression=expression,
+        user_gesture=True,
+        await_promise=await_promise,
+        return_by_value=True,
+        allow_unsafe_eval_blocked_by_csp=True,
+    ))
+    if errors:
+        detail = errors.exception.description if errors.exception else errors.text
+        raise RuntimeError(f"Page script failed: {detail}")
+    return remote_object.value
+
+async def wait_for_selector(tab: uc.Tab, selector: str, timeout: float = 30) -> Optional[str]:
+    """
+    Wait inside the page until an element matches a CSS selector.
+    
+    Args:
+        tab: Tab to wait in.
+        selector: CSS selector (or comma-separated selector list) to wait for.
+        timeout: Seconds to wait before giving up.
+    
+    Returns:
+        Lowercase tag name of the first matching element, or None on timeout.
+    """
+    return await evaluate_js(
+        tab,
+        WAIT_FOR_SELECTOR_JS % (json.dumps(selector), int(timeout * 1000)),
+        await_promise=True,
+    )
+
+async def get_outer_html(tab: uc.Tab, selector: str) -> str:
+    """
+    Serialize only the subtree under the first element matching a CSS selector.
+    The root is fetched without children, so Chrome never ships the full DOM tree over CDP.
+    
+    Args:
+        tab: Tab to read from.
+        selector: CSS selector of the subtree root.
+    
+    Returns:
+        Outer HTML of the matched element, or of the whole page if nothing matches.
+    """
+    doc = await tab.send(uc.cdp.dom.get_document(depth=0))
+    node_id = await tab.send(uc.cdp.dom.query_selector(doc.node_id, selector))
+    if not node_id:
+        return await tab.get_content()
+    return await tab.send(uc.cdp.dom.get_outer_html(node_id=node_id))
+
+async def ensure_logged_in(browser: uc.Browser) -> bool:
+    """
+    Open WhatsApp Web and wait for the session to be ready, prompting for a QR scan if needed.
+    
+    Args:
+        browser: Started nodriver Browser.
+    
+    Returns:
+        True if logged in, False on failure.
+    """
+    tab = await open_tab(browser, WHATSAPP_WEB_URL)
+    print("Checking WhatsApp Web login status...")
+    
+    try:
+        probe = await wait_for_selector(tab, LOGIN_PROBE_SELECTOR, timeout=20)
+        if probe is None:
+            print("Login error: WhatsApp Web did not load")
+            return False
+        
+        if probe == "canvas":
+            print("\n" + "="*70)
+            print("QR CODE DETECTED - PLEASE SCAN TO LOGIN")
+            print("="*70)
+            if await wait_for_selector(tab, LOGGED_IN_SELECTOR, timeout=60) is None:
+                print("Login error: QR code was not scanned in time")
+                return False
+            print("Successfully logged in!")
+            await wait_for_selector(tab, CHAT_LIST_SELECTOR, timeout=10)
+        else:
+            print("Already logged in!")
+        return True
+    except Exception as e:
+        print(f"Login error: {e}")
+        return False
+
+class WhatsAppBrowserSession:
+    """
+    Async context manager holding one logged-in WhatsApp Web browser for several channels.
+    Chrome is launched (or reused) and the login is checked on entry; every channel
+    scraped through the session then only costs a new tab. A session kept across
+    aggregation runs skips the login check while it is still on the same Chrome.
+    """
+    
+    def __init__(self, user_data_dir: str = CHROME_PROFILE_DIR):
+        self.user_data_dir = user_data_dir
+        self.browser: Optional[uc.Browser] = None
+        self.logged_in = False
+        # Serializes entries so channels entering concurrently share one login check on the main
+        # tab; recreated when the session is entered from a different event loop, like the browser
+        self._entry_lock: Optional[asyncio.Lock] = None
+        self._entry_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def __aenter__(self) -> "WhatsAppBrowserSession":
+        loop = asyncio.get_running_loop()
+        if self._entry_loop is not loop:
+            self._entry_lock = asyncio.Lock()
+            self._entry_loop = loop
+        async with self._entry_lock:
+            browser = await get_browser(self.user_data_dir)
+            if browser is not self.browser or not self.logged_in:
+                self.browser = browser
+                self.logged_in = await ensure_logged_in(browser)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        # Chrome and the login state stay up for the next entry; stop_browser() shuts Chrome down at exit
+        pass
+    
+    async def fetch_channel(self, channel_url: str, source_name: str) -> List[Dict]:
+        """
+        Scrape one channel with this session's browser.
+        
+        Args:
+            channel_url: WhatsApp channel URL.
+            source_name: Display name of the channel.
+        
+        Returns:
+            List of extracted message dictionaries.
+        """
+        adapter = WhatsAppChannelAdapter(channel_url, source_name, self.user_data_dir, session=self)
+        return await adapter.fetch_posts()
+
 class WhatsAppChannelAdapter(SourceAdapter):
     """
     Adapter for scraping WhatsApp channels.
-    Handles Selenium-based navigation, scrolling, and HTML export for message extraction.
+    Drives Chrome over CDP with nodriver for navigation, scrolling, and in-page collection of message text.
     """
     
-    def __init__(self, channel_url: str, source_name: str, chrome_driver_path: str, 
-                 user_data_dir: str = CHROME_PROFILE_DIR):
+    def __init__(self, channel_url: str, source_name: str, user_data_dir: str = CHROME_PROFILE_DIR,
+                 session: Optional[WhatsAppBrowserSession] = None):
         super().__init__(source_name)
         self.channel_url = channel_url
-        self.chrome_driver_path = chrome_driver_path
         self.user_data_dir = user_data_dir
+        self.session = session
         self.html_path = None
     
-    def fetch_posts(self) -> List[Dict]:
+    async def fetch_posts(self, session: Optional[WhatsAppBrowserSession] = None) -> List[Dict]:
+        """
+        Scrape the channel in a new tab and extract messages from its HTML.
+        
+        Args:
+            session: Browser session to open the channel in. Defaults to the session given
+                     at construction; if neither is set, a session is created just for this call.
+        
+        Returns:
+            List of extracted message dictionaries.
+        """
+        session = session or self.session or WhatsAppBrowserSession(self.user_data_dir)
+        # Entering an already logged-in session on the current Chrome is only a liveness check
+        async with session:
+            if not session.logged_in:
+                return []
+            return await self._scrape(session)
+    
+    async def _scrape(self, session: WhatsAppBrowserSession) -> List[Dict]:
         """
-        Scrape the channel, save HTML, and extract messages.
+        Open the channel in a new tab of a logged-in session and extract its messages.
+        
+        Args:
+            session: Entered, logged-in browser session.
         
         Returns:
             List of extracted message dictionaries.
         """
-        driver = None
+        tab = None
         
         try:
-            # Create debug directory
-            os.makedirs(DEBUG_DIR, exist_ok=True)
-            
-            options = webdriver.ChromeOptions()
-            options.add_argument(f"--user-data-dir={self.user_data_dir}")
-            options.add_argument("--profile-directory=Default")
-            options.add_argument("--remote-debugging-port=9222")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--start-maximized")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            service = Service(self.chrome_driver_path)
-            driver = webdriver.Chrome(service=service, options=options)
-            
-            print(f"\nOpening WhatsApp channel: {self.channel_url}")
-            
-            # Login
-            driver.get("https://web.whatsapp.com")
-            print("Checking WhatsApp Web login status...")
-            
-            try:
-                WebDriverWait(driver, 20).until(
-                    lambda d: d.find_elements(By.XPATH, "//canvas[@aria-label='Scan me!']") or
-                            d.find_elements(By.XPATH, "//*[@id='side']") or
-                            d.find_elements(By.XPATH, "//*[@data-testid='chat-list']")
-                )
-                
-                qr_elements = driver.find_elements(By.XPATH, "//canvas[@aria-label='Scan me!']")
-                if qr_elements:
-                    print("\n" + "="*70)
-                    print("QR CODE DETECTED - PLEASE SCAN TO LOGIN")
-                    print("="*70)
-                    WebDriverWait(driver, 60).until(
-                        EC.presence_of_element_located((By.XPATH, "//*[@id='side']"))
-                    )
-                    print("Successfully logged in!")
-                    time.sleep(10)
-                else:
-                    print("Already logged in!")
-            except Exception as e:
-                print(f"Login error: {e}")
-                return []
-            
             # Navigate to channel
-            print(f"\nNavigating to channel...")
-            driver.get(self.channel_url)
-            time.sleep(10)
+            print(f"\nOpening WhatsApp channel: {self.channel_url}")
+            tab = await open_tab(session.browser, self.channel_url, new_tab=True)
+            await wait_for_selector(
+                tab, f"{VIEW_CHANNEL_SELECTOR}, {MESSAGES_PANE_SELECTOR}, #main", timeout=15
+            )
             
             # Try to click "View channel" button
-            view_channel_selectors = [
-                "//a[contains(@class, '_9vcv') and contains(@class, '_advm')]",
-                "//span[contains(@class, '_advp') and contains(text(), 'View channel')]/..",
-                "//a[contains(text(), 'View channel')]",
-                "//button[contains(text(), 'View channel')]",
-            ]
-            
-            for selector in view_channel_selectors:
-                try:
-                    button = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    driver.execute_script("arguments[0].scrollIntoView(true);", button)
-                    time.sleep(2)
-                    driver.execute_script("arguments[0].click();", button)
-                    time.sleep(10)
-                    break
-                except Exception:
-                    continue
+            clicked = await evaluate_js(
+                tab,
+                CLICK_VIEW_CHANNEL_JS % (json.dumps(VIEW_CHANNEL_SELECTOR), json.dumps("View channel"))
+            )
+            if clicked:
+                print(f"[{self.source_name}] Clicked View channel")
             
             # Wait for message pane
-            print("Waiting for messages to load...")
-            try:
-                messages_pane = WebDriverWait(driver, 30).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='conversation-panel-messages']"))
-                )
-                print("Message pane loaded")
-            except Exception:
-                messages_pane = driver.find_element(By.ID, "main")
-                print("Using main container")
+            print(f"[{self.source_name}] Waiting for messages to load...")
+            pane_selector = MESSAGES_PANE_SELECTOR
+            if await wait_for_selector(tab, pane_selector, timeout=30):
+                print(f"[{self.source_name}] Message pane loaded")
+            else:
+                pane_selector = "#main"
+                if await wait_for_selector(tab, pane_selector, timeout=10) is None:
+                    print(f"[{self.source_name}] No message pane found")
+                    # Possibly logged out; make the next entry of the session check again
+                    session.logged_in = False
+                    return []
+                print(f"[{self.source_name}] Using main container")
             
-            time.sleep(15)
+            await wait_for_selector(tab, MESSAGE_ROW_SELECTOR, timeout=15)
             
             # Scroll to load history
-            print("Scrolling to load message history...")
-            last_height = driver.execute_script("return arguments[0].scrollHeight", messages_pane)
-            
-            for attempt in range(15):
-                driver.execute_script("arguments[0].scrollTop = 0;", messages_pane)
-                time.sleep(5)
-                new_height = driver.execute_script("return arguments[0].scrollHeight", messages_pane)
-                
-                if new_height == last_height:
-                    print(f"Reached top after {attempt + 1} scrolls")
-                    break
-                
-                last_height = new_height
-                print(f"   Scroll {attempt + 1}/15...")
-            
-            time.sleep(10)
+            print(f"[{self.source_name}] Scrolling to load message history...")
+            scroll = await evaluate_js(
+                tab,
+                SCROLL_TO_TOP_JS % (json.dumps(pane_selector), SCROLL_MAX_STEPS, SCROLL_WAIT_MS, SCROLL_QUIET_MS),
+                await_promise=True,
+            )
+            if scroll['reachedTop']:
+                print(f"[{self.source_name}] Reached top after {scroll['scrolls']} scrolls")
+            else:
+                print(f"[{self.source_name}] Stopped after {scroll['scrolls']} scrolls")
             
-            # Save full page HTML
-            self.html_path = f"{DEBUG_DIR}/messages_{self.source_name.replace(' ', '_')}.html"
-            page_html = driver.page_source
+            # Keep a copy of the pane for debugging selectors; only the pane is serialized
+            if SAVE_DEBUG_HTML:
+                page_html = await get_outer_html(tab, pane_selector)
+                print(f"\n[{self.source_name}] Pane HTML size: {len(page_html) / 1024:.2f} KB")
+                os.makedirs(DEBUG_DIR, exist_ok=True)
+                self.html_path = f"{DEBUG_DIR}/messages_{self.source_name.replace(' ', '_')}.html"
+                with open(self.html_path, 'w', encoding='utf-8') as f:
+                    f.write(page_html)
+                print(f"Saved HTML: {self.html_path}")
             
-            with open(self.html_path, 'w', encoding='utf-8') as f:
-                f.write(page_html)
+            # Read message text in the page and parse timestamps locally
+            print(f"[{self.source_name}] Extracting messages...")
+            records = await evaluate_js(
+                tab,
+                EXTRACT_MESSAGES_JS % (json.dumps(pane_selector), json.dumps(MESSAGE_SELECTORS))
+            )
+            messages = HTMLMessageExtractor.extract_from_records(records or [])
             
-            print(f"\nSaved HTML: {self.html_path}")
-            print(f"   File size: {len(page_html) / 1024:.2f} KB")
-            
-            # Extract messages using BeautifulSoup
-            print("\nExtracting messages from HTML...")
-            messages = HTMLMessageExtractor.extract_from_html(self.html_path)
-            
-            print(f"Extracted {len(messages)} messages with valid timestamps")
+            print(f"[{self.source_name}] Extracted {len(messages)} messages with valid timestamps")
             
             if messages:
                 print("\n   Sample messages:")
@@ -192,7 +546,7 @@ class WhatsAppChannelAdapter(SourceAdapter):
                     print(f"      {i+1}. [{ts_preview}] {text_preview}")
             
             return messages
-            
+        
         except Exception as e:
             print(f"Error scraping {self.source_name}: {e}")
             import traceback
@@ -200,6 +554,51 @@ class WhatsAppChannelAdapter(SourceAdapter):
             return []
         
         finally:
-            if driver:
-                driver.quit()
-                print("Browser closed")
\ No newline at end of file
+            if tab:
+                await tab.close()
+
+async def fetch_all(sources: Optional[List[SourceAdapter]] = None,
+                    max_concurrency: int = MAX_CONCURRENT_CHANNELS) -> List[List[Dict]]:
+    """
+    Scrape several sources concurrently.
+    WhatsApp channels share one WhatsAppBrowserSession (one Chrome process and one login), each running in its own tab.
+    
+    Args:
+        sources: Adapters to scrape. Defaults to every channel in ENABLED_WHATSAPP_CHANNELS.
+        max_concurrency: Maximum number of sources scraped at the same time.
+    
+    Returns:
+        One list of message dictionaries per source, in the same order as sources.
+    """
+    if sources is None:
+        sources = [
+            WhatsAppChannelAdapter(channel_url=channel["url"], source_name=channel["name"])
+            for channel in ENABLED_WHATSAPP_CHANNELS
+        ]
+    
+    whatsapp_sources = [s for s in sources if isinstance(s, WhatsAppChannelAdapter)]
+    # Reuse the long-lived session the adapters were built with, if any
+    session = next((s.session for s in whatsapp_sources if s.session), None)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run(source: SourceAdapter) -> List[Dict]:
+        async with semaphore:
+            if isinstance(source, WhatsAppChannelAdapter):
+                return await source.fetch_posts(session=session)
+            return await source.fetch_posts()
+    
+    async with contextlib.AsyncExitStack() as stack:
+        if whatsapp_sources:
+            session = await stack.enter_async_context(
+                session or WhatsAppBrowserSession(whatsapp_sources[0].user_data_dir)
+            )
+        results = await asyncio.gather(*(run(source) for source in sources), return_exceptions=True)
+    
+    all_messages = []
+    for source, result in zip(sources, results):
+        if isinstance(result, BaseException):
+            print(f"Error scraping {source.source_name}: {result}")
+            result = []
+        all_messages.append(result)
+    
+    return all_messages
@@ -9,17 +9,62 @@ or a configuration management system (e.g., Consul, etcd) in distributed environ
 
 import os
 
-# Chrome and Selenium configuration
-CHROME_DRIVER_PATH = "/home/ambrish/Desktop/job-aggregation-agent/chromedriver-linux64/chromedriver"
+# Chrome (nodriver/CDP) configuration
 CHROME_PROFILE_DIR = "/home/ambrish/selenium-profile"
+# Set CHROME_HEADLESS=0 for the first run so the WhatsApp Web QR code can be scanned
+CHROME_HEADLESS = os.getenv("CHROME_HEADLESS", "1") != "0"
+# Set CHROME_REMOTE_HOST to drive an already running Chrome (e.g. a container started with
+# --remote-debugging-port) instead of launching one locally; its own profile must be logged in
+CHROME_REMOTE_HOST = os.getenv("CHROME_REMOTE_HOST")
+CHROME_REMOTE_PORT = int(os.getenv("CHROME_REMOTE_PORT", "9222"))
+
+# History scrolling: at most SCROLL_MAX_STEPS scrolls to the top; after each, wait up to
+# SCROLL_WAIT_MS for older messages to start arriving and stop once the pane has been
+# quiet for SCROLL_QUIET_MS. Lower the waits on fast connections, raise them on slow ones.
+SCROLL_MAX_STEPS = int(os.getenv("SCROLL_MAX_STEPS", "15"))
+SCROLL_WAIT_MS = int(os.getenv("SCROLL_WAIT_MS", "800"))
+SCROLL_QUIET_MS = int(os.getenv("SCROLL_QUIET_MS", "500"))
 
 # Ollama configuration
 OLLAMA_URL = "http://localhost:11434"
-OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "gpt-oss")
+# A 4-bit quantized 3B instruct model is plenty for extract-to-JSON and decodes several times
+# faster than a large FP16 model; set OLLAMA_MODEL to use another pulled model
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2:3b-instruct-q4_K_M")
+# How long Ollama keeps the model loaded after the last request
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "1h")
+# Messages sent together in one prompt; the instructions are then processed once per group
+OLLAMA_PROMPT_BATCH_SIZE = 4
+# Generation options sent with every parse request. A job JSON object needs well under 200 tokens
+# (num_predict is per message). The context fits the ~350-token instructions plus, per message in
+# a group, a long post and its answer. It is the same for every request: Ollama reloads the model
+# whenever num_ctx changes. num_batch evaluates a whole prompt in a few chunks, and num_gpu offloads
+# every layer to the GPU (set OLLAMA_NUM_GPU to a lower layer count if the model does not fit in VRAM).
+OLLAMA_OPTIONS = {
+    "temperature": 0.1,
+    "top_p": 0.9,
+    "num_predict": 192,
+    "num_ctx": 1024 + 768 * OLLAMA_PROMPT_BATCH_SIZE,
+    "num_batch": 512,
+    "num_gpu": int(os.getenv("OLLAMA_NUM_GPU", "999")),
+}
+# Parse requests kept in flight at once; Ollama queues anything beyond OLLAMA_NUM_PARALLEL
+OLLAMA_CONCURRENCY = 8
+# Pooled keep-alive connections to Ollama; requests in flight are bounded by the concurrency above
+OLLAMA_CONNECTION_LIMIT = 32
 
 # Database and file paths
 DATABASE_PATH = "newjobdb.db"
+# Seconds dashboard query results are cached between refreshes
+DASHBOARD_CACHE_TTL = 30
+# SQLite connections kept open per database file for dashboard and aggregator queries
+DB_POOL_SIZE = 4
+# Queued raw posts claimed, parsed and saved per step; each step's jobs go in one transaction
+PARSE_BATCH_SIZE = 100
+# Seconds the background parser (master.py --worker) sleeps when the queue is empty
+PARSE_POLL_SECONDS = 30
 DEBUG_DIR = "debug_html"
+# Set DEBUG_HTML=1 to keep a copy of every scraped page in DEBUG_DIR
+SAVE_DEBUG_HTML = bool(os.getenv("DEBUG_HTML"))
 
 # WhatsApp channels to monitor
 CHANNELS = {
@@ -40,4 +85,7 @@ CHANNELS = {
             "enabled": True,
         },
     ],
-}
\ No newline at end of file
+}
+
+# Channels that are actually scraped, resolved once at import
+ENABLED_WHATSAPP_CHANNELS = [c for c in CHANNELS["WhatsApp"] if c["enabled"]]
@@ -4,13 +4,41 @@ Job Aggregator Dashboard Server
 Modern Flask-based web interface for job aggregation system
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
 from typing import Dict, List
 import json
 
-from database import get_statistics, get_chart_data, get_filtered_jobs, get_filter_options
+import orjson
+
+from database import (ensure_schema, iter_jobs, get_statistics, get_chart_data, get_filtered_jobs,
+                      get_filter_options, clear_dashboard_cache)
+
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider backed by orjson, so jsonify() and request.get_json() skip the pure-Python encoder.
+    orjson emits bytes directly, which go into the response without a str round trip.
+    """
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Gzip API responses; job pages with descriptions compress several times over
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
 
 DATABASE_PATH = "newjobdb.db"  # Kept for compatibility, but functions use it internally
 
@@ -53,10 +81,36 @@ def api_jobs():
         'source': request.args.get('source', 'all'),
         'experience': request.args.get('experience', 'all'),
         'page': request.args.get('page', 1),
-        'per_page': request.args.get('per_page', 20)
+        'cursor': request.args.get('cursor', ''),
+        'per_page': request.args.get('per_page', 20),
+        'fields': request.args.get('fields', 'list')
     }
     return jsonify(get_filtered_jobs(filters))
 
+@app.route('/api/jobs/export')
+def api_jobs_export():
+    """
+    API endpoint streaming every job matching the filters as one JSON array.
+    Rows are read and encoded chunk by chunk, so memory stays flat however many jobs match.
+    """
+    filters = {
+        'job_type': request.args.get('job_type', ''),
+        'location': request.args.get('location', ''),
+        'date_range': request.args.get('date_range', ''),
+    }
+    
+    def generate():
+        yield b'['
+        first = True
+        for chunk in iter_jobs(filters):
+            body = orjson.dumps(chunk)[1:-1]
+            if body:
+                yield body if first else b',' + body
+                first = False
+        yield b']'
+    
+    return Response(generate(), mimetype='application/json')
+
 @app.route('/api/filter-options')
 def api_filter_options():
     """
@@ -64,7 +118,18 @@ def api_filter_options():
     """
     return jsonify(get_filter_options())
 
+@app.route('/api/refresh', methods=['POST'])
+def api_refresh():
+    """
+    API endpoint to drop cached query results so the next requests read fresh data.
+    """
+    clear_dashboard_cache()
+    return jsonify({'status': 'ok'})
+
 if __name__ == '__main__':
+    # The routes only read; a database the aggregator has not migrated yet gets its indexes
+    # and search table here, once, before serving
+    ensure_schema()
     print("\nStarting Job Aggregator Dashboard...")
     print("Dashboard URL: http://localhost:5000")
     print("="*50)
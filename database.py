@@ -7,58 +7,307 @@ to support migration to PostgreSQL/MySQL for sharding/replication in high-traffi
 Common operations are parameterized to prevent SQL injection and support connection pooling.
 """
 
+import base64
+import functools
+import json
+import queue
+import re
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional
 
-from config import DATABASE_PATH
+import orjson
+import pandas as pd
+
+from config import DASHBOARD_CACHE_TTL, DATABASE_PATH, DB_POOL_SIZE
 from models import JobPost
+from utils import make_post_id, make_text_hash
+
+# Bumped whenever make_post_id changes, so init_db rewrites the stored keys to match.
+# Version 0 is the original MD5 key; 1 is XXH3-64 and 2 is XXH3-128 over the stored company,
+# role and date.
+POST_ID_SCHEME = 2
+
+# Applied to every connection. WAL lets the dashboard read while the aggregator writes,
+# NORMAL sync skips the per-commit fsync that WAL makes unnecessary, mmap (1 GiB) and the page
+# cache (up to 128 MiB) keep hot pages in memory, and busy_timeout makes a connection wait for
+# a concurrent writer instead of failing with "database is locked".
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=1073741824",
+    "PRAGMA cache_size=-131072",
+    "PRAGMA busy_timeout=30000",
+)
+
+def open_connection(db_path: str = DATABASE_PATH, read_only: bool = False) -> sqlite3.Connection:
+    """
+    Open a tuned autocommit SQLite connection that may be shared across threads.
+    
+    Args:
+        db_path: Database file to open.
+        read_only: Put the connection in query_only mode.
+    
+    Returns:
+        SQLite connection object.
+    """
+    conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None,
+                           cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    if read_only:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+# Single statement text for every job insert, so the writer's statement cache always hits
+INSERT_JOB_SQL = '''
+    INSERT OR IGNORE INTO newjobdb 
+    (post_id, role, company_name, location, experience_required, 
+     job_type, application_link, description, source, date_posted, extracted_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+class ConnectionPool:
+    """
+    Thread-safe pool of tuned SQLite connections for one database file.
+    Connections are opened lazily up to size and kept warm across requests, so request
+    threads never pay for a fresh connect and PRAGMA setup.
+    """
+    
+    def __init__(self, db_path: str = DATABASE_PATH, size: int = DB_POOL_SIZE, read_only: bool = False):
+        self.db_path = db_path
+        self.size = size
+        self.read_only = read_only
+        self._idle: queue.Queue = queue.Queue(maxsize=size)
+        self._opened = 0
+        self._lock = threading.Lock()
+    
+    def get(self) -> sqlite3.Connection:
+        """Take an idle connection, opening a new one while the pool is below size."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                try:
+                    return open_connection(self.db_path, self.read_only)
+                except Exception:
+                    self._opened -= 1
+                    raise
+        
+        return self._idle.get()
+    
+    def put(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, rolling back anything left uncommitted."""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+_POOLS: Dict[tuple, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+@contextmanager
+def borrow_conn(db_path: str = DATABASE_PATH, read_only: bool = False) -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a pooled connection for the duration of a with block.
+    Connections run in autocommit mode and must not be closed by callers.
+    
+    Args:
+        db_path: Database file whose pool to borrow from.
+        read_only: Borrow from the separate query_only pool used for reads, which can
+                   never take the write lock or modify the file by accident.
+    
+    Yields:
+        SQLite connection object.
+    """
+    key = (db_path, read_only)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = ConnectionPool(db_path, read_only=read_only)
+    
+    conn = pool.get()
+    try:
+        yield conn
+    finally:
+        pool.put(conn)
 
 class JobDatabase:
     """
     SQLite database class for job storage and querying.
     Manages schema, insertions, and retrievals with optional filtering.
+    Writes go through one long-lived connection owned by the instance; in WAL mode readers
+    on the pooled read-only connections keep working while it holds the write lock.
     """
     
     def __init__(self, db_path: str = DATABASE_PATH):
         self.db_path = db_path
+        self.conn = open_connection(db_path)
+        self._write_lock = threading.Lock()
         self.init_db()
     
+    def close(self):
+        """Close the writer connection."""
+        self.conn.close()
+    
     def init_db(self):
         """Initialize the database schema if it does not exist."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS newjobdb (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    post_id TEXT UNIQUE,
+                    role TEXT NOT NULL,
+                    company_name TEXT NOT NULL,
+                    location TEXT,
+                    experience_required TEXT,
+                    job_type TEXT,
+                    application_link TEXT,
+                    description TEXT,
+                    source TEXT,
+                    date_posted TEXT NOT NULL,
+                    extracted_at TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            self._migrate_post_ids(cursor)
+            
+            # Job type normalized once per row for the chart; Remote-Hybrid counts as Hybrid
+            cursor.execute("SELECT name FROM pragma_table_xinfo('newjobdb')")
+            if 'job_type_bucket' not in {row[0] for row in cursor.fetchall()}:
+                cursor.execute('''
+                    ALTER TABLE newjobdb ADD COLUMN job_type_bucket TEXT GENERATED ALWAYS AS (
+                        CASE 
+                            WHEN job_type LIKE '%hybrid%' THEN 'Hybrid'
+                            WHEN job_type LIKE '%remote%' THEN 'Remote'
+                            WHEN job_type LIKE '%on-site%' OR job_type LIKE '%onsite%' THEN 'On-site'
+                            ELSE 'Not Specified'
+                        END
+                    ) VIRTUAL
+                ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_newjobdb_job_type_bucket ON newjobdb(job_type_bucket)")
+            
+            # Indexes for the dashboard: date ordering/ranges and the exact-match filters
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_newjobdb_date_id ON newjobdb(date_posted DESC, id DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_newjobdb_type_source ON newjobdb(job_type, source)")
+            # Source equality filter, source grouping/DISTINCT lists, and the ordered company list
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_newjobdb_source_date ON newjobdb(source, date_posted DESC, id DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_newjobdb_company ON newjobdb(company_name)")
+            # Case-insensitive index so the company prefix filter (LIKE 'term%') is a range scan
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_newjobdb_company_nocase ON newjobdb(company_name COLLATE NOCASE)")
+            
+            # Full-text index over the searchable columns, kept in sync with newjobdb by triggers
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'jobs_fts'")
+            fts_exists = cursor.fetchone() is not None
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                    role, company_name, description,
+                    content='newjobdb', content_rowid='id', tokenize='porter unicode61'
+                )
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS newjobdb_fts_insert AFTER INSERT ON newjobdb BEGIN
+                    INSERT INTO jobs_fts(rowid, role, company_name, description)
+                    VALUES (new.id, new.role, new.company_name, new.description);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS newjobdb_fts_delete AFTER DELETE ON newjobdb BEGIN
+                    INSERT INTO jobs_fts(jobs_fts, rowid, role, company_name, description)
+                    VALUES ('delete', old.id, old.role, old.company_name, old.description);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS newjobdb_fts_update AFTER UPDATE ON newjobdb BEGIN
+                    INSERT INTO jobs_fts(jobs_fts, rowid, role, company_name, description)
+                    VALUES ('delete', old.id, old.role, old.company_name, old.description);
+                    INSERT INTO jobs_fts(rowid, role, company_name, description)
+                    VALUES (new.id, new.role, new.company_name, new.description);
+                END
+            ''')
+            if not fts_exists:
+                # Index the rows stored before the full-text table existed
+                cursor.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS duplicates (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    original_post_id TEXT,
+                    duplicate_post_id TEXT,
+                    similarity_score REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            # LLM verdicts keyed by a hash of the model and message text, so re-scraped messages skip the model
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS parse_cache (
+                    text_hash TEXT PRIMARY KEY,
+                    parsed_json TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                ) WITHOUT ROWID
+            ''')
+            # Scraped messages waiting for (or done with) LLM parsing; the scraper only appends here
+            # and the parser drains 'pending' rows in insertion order
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS raw_posts (
+                    post_hash TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    timestamp TEXT,
+                    extracted_at TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_raw_posts_pending ON raw_posts(status) WHERE status = 'pending'")
+            # Duplicate detection partitions by these columns and orders by id inside each group
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_newjobdb_dedup ON newjobdb(company_name, role, location, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_duplicates_duplicate ON duplicates(duplicate_post_id)")
+    
+    @staticmethod
+    def _migrate_post_ids(cursor: sqlite3.Cursor):
+        """
+        Recompute stored post_ids (and the duplicates that reference them) after a key change,
+        so posts scraped again on the next run are still recognized as already stored.
         
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS newjobdb (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                post_id TEXT UNIQUE,
-                role TEXT NOT NULL,
-                company_name TEXT NOT NULL,
-                location TEXT,
-                experience_required TEXT,
-                job_type TEXT,
-                application_link TEXT,
-                description TEXT,
-                source TEXT,
-                date_posted TEXT NOT NULL,
-                extracted_at TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS duplicates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                original_post_id TEXT,
-                duplicate_post_id TEXT,
-                similarity_score REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        Args:
+            cursor: Cursor on the writer connection.
+        """
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= POST_ID_SCHEME:
+            return
+        
+        cursor.execute("SELECT post_id, company_name, role, date_posted FROM newjobdb")
+        remap = [(make_post_id(company, role, posted), old) for old, company, role, posted in cursor.fetchall()]
+        remap = [(new, old) for new, old in remap if new != old]
+        
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # Rows whose new key already exists are duplicates; they keep their old key
+            cursor.executemany("UPDATE OR IGNORE newjobdb SET post_id = ? WHERE post_id = ?", remap)
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'duplicates'")
+            if cursor.fetchone():
+                cursor.executemany("UPDATE duplicates SET original_post_id = ? WHERE original_post_id = ?", remap)
+                cursor.executemany("UPDATE duplicates SET duplicate_post_id = ? WHERE duplicate_post_id = ?", remap)
+            cursor.execute(f"PRAGMA user_version = {POST_ID_SCHEME}")
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
         
-        conn.commit()
-        conn.close()
+        if remap:
+            print(f"Migrated {len(remap)} post ids to key scheme {POST_ID_SCHEME}")
     
     def insert_job(self, job: JobPost) -> bool:
         """
@@ -70,41 +319,207 @@ class JobDatabase:
         Returns:
             True if inserted (new), False if duplicate.
         """
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO newjobdb 
-                (post_id, role, company_name, location, experience_required, 
-                 job_type, application_link, description, source, date_posted, extracted_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                job.post_id, job.role, job.company_name, job.location,
-                job.experience_required, job.job_type, job.application_link,
-                job.description, job.source, job.date_posted, job.extracted_at
-            ))
-            
-            conn.commit()
-            conn.close()
-            return True
-        except sqlite3.IntegrityError:
-            return False
+        return self.insert_jobs([job]) == 1
     
-    def get_all_jobs(self, filters: Optional[Dict] = None) -> List[Dict]:
+    def insert_jobs(self, jobs: List[JobPost]) -> int:
         """
-        Retrieve jobs with optional filters applied.
+        Insert many job posts in a single transaction, skipping duplicates.
         
         Args:
-            filters: Optional dictionary of filters (e.g., {'job_type': 'Remote'}).
+            jobs: JobPost instances.
         
         Returns:
-            List of job dictionaries.
+            Number of jobs actually inserted.
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        if not jobs:
+            return 0
+        
+        # Rows are produced lazily while executemany steps the one prepared statement
+        rows = (
+            (job.post_id, job.role, job.company_name, job.location,
+             job.experience_required, job.job_type, job.application_link,
+             job.description, job.source, job.date_posted, job.extracted_at)
+            for job in jobs
+        )
+        
+        with self._write_lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = conn.executemany(INSERT_JOB_SQL, rows)
+                inserted = cursor.rowcount
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        
+        return inserted
+    
+    def find_duplicates(self) -> int:
+        """
+        Record jobs repeating an earlier post's company, role and location in the duplicates table.
+        Each group is matched in one indexed pass, keeping its lowest id as the original.
+        
+        Returns:
+            Number of newly recorded duplicates.
+        """
+        with self._write_lock:
+            cursor = self.conn.execute('''
+                INSERT INTO duplicates (original_post_id, duplicate_post_id, similarity_score)
+                SELECT original_post_id, post_id, 1.0 FROM (
+                    SELECT post_id, FIRST_VALUE(post_id) OVER (
+                        PARTITION BY company_name, role, location ORDER BY id
+                    ) AS original_post_id
+                    FROM newjobdb
+                ) AS grouped
+                WHERE post_id != original_post_id
+                  AND NOT EXISTS (SELECT 1 FROM duplicates WHERE duplicate_post_id = grouped.post_id)
+            ''')
+            return cursor.rowcount
+    
+    def get_cached_parses(self, text_hashes: List[str]) -> Dict[str, Dict]:
+        """
+        Look up cached LLM results for several messages in one query.
+        
+        Args:
+            text_hashes: Cache keys from the parser (message text and model hash).
+        
+        Returns:
+            Dictionary mapping each cached key to its parsed result.
+        """
+        if not text_hashes:
+            return {}
         
+        with borrow_conn(self.db_path, read_only=True) as conn:
+            rows = conn.execute(
+                "SELECT text_hash, parsed_json FROM parse_cache WHERE text_hash IN (SELECT value FROM json_each(?))",
+                (json.dumps(text_hashes),)
+            ).fetchall()
+        return {text_hash: orjson.loads(parsed_json) for text_hash, parsed_json in rows}
+    
+    def cache_parses(self, entries: List[tuple]) -> None:
+        """
+        Store LLM results in the parse cache in one transaction.
+        
+        Args:
+            entries: (text_hash, parsed result dictionary) pairs.
+        """
+        if not entries:
+            return
+        
+        rows = [(text_hash, orjson.dumps(parsed).decode()) for text_hash, parsed in entries]
+        with self._write_lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany("INSERT OR IGNORE INTO parse_cache (text_hash, parsed_json) VALUES (?, ?)", rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+    
+    def queue_raw_posts(self, source: str, messages: List[Dict], extracted_at: str) -> int:
+        """
+        Queue scraped messages for parsing, ignoring ones already queued on an earlier run.
+        
+        Args:
+            source: Source name.
+            messages: Message dictionaries with 'text' and 'timestamp' keys.
+            extracted_at: Scrape time in ISO format.
+        
+        Returns:
+            Number of newly queued messages.
+        """
+        if not messages:
+            return 0
+        
+        rows = (
+            (make_text_hash(f"{source}\x00{msg.get('timestamp')}\x00{msg.get('text', '')}"),
+             source, msg.get('text', ''), msg.get('timestamp'), extracted_at)
+            for msg in messages
+        )
+        with self._write_lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = conn.executemany('''
+                    INSERT OR IGNORE INTO raw_posts (post_hash, source, text, timestamp, extracted_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', rows)
+                queued = cursor.rowcount
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return queued
+    
+    def claim_raw_posts(self, limit: int) -> List[Dict]:
+        """
+        Take the oldest pending raw posts and mark them as being parsed, in one statement.
+        
+        Args:
+            limit: Maximum number of posts to claim.
+        
+        Returns:
+            Claimed posts as dictionaries, oldest first.
+        """
+        with self._write_lock:
+            rows = self.conn.execute('''
+                UPDATE raw_posts SET status = 'parsing'
+                WHERE post_hash IN (
+                    SELECT post_hash FROM raw_posts WHERE status = 'pending' ORDER BY rowid LIMIT ?
+                )
+                RETURNING rowid, post_hash, source, text, timestamp, extracted_at
+            ''', (limit,)).fetchall()
+        return [dict(row) for row in sorted(rows, key=lambda row: row[0])]
+    
+    def mark_raw_posts(self, statuses: Dict[str, List[str]]) -> None:
+        """
+        Set the status of a batch's raw posts in one transaction.
+        
+        Args:
+            statuses: New status ('parsed', 'skipped', 'failed' or 'pending') mapped to the keys
+                of the posts to update.
+        """
+        rows = [(status, post_hash) for status, post_hashes in statuses.items() for post_hash in post_hashes]
+        if not rows:
+            return
+        
+        with self._write_lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany("UPDATE raw_posts SET status = ? WHERE post_hash = ?", rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+    
+    def requeue_raw_posts(self) -> int:
+        """
+        Return failed posts, and posts left mid-parse by an interrupted parser, to the queue.
+        Only one parser may drain a database, so run this before it starts.
+        
+        Returns:
+            Number of posts requeued.
+        """
+        with self._write_lock:
+            cursor = self.conn.execute(
+                "UPDATE raw_posts SET status = 'pending' WHERE status IN ('parsing', 'failed')"
+            )
+            return cursor.rowcount
+    
+    @staticmethod
+    def _build_jobs_query(filters: Optional[Dict] = None):
+        """
+        Build the filtered job listing query shared by get_all_jobs and get_jobs_dataframe.
+        
+        Args:
+            filters: Optional dictionary of filters (e.g., {'job_type': 'Remote'}).
+        
+        Returns:
+            Tuple of (SQL query, parameter list).
+        """
         query = "SELECT * FROM newjobdb WHERE 1=1"
         params = []
         
@@ -121,36 +536,150 @@ class JobDatabase:
                 params.append(seven_days_ago)
         
         query += " ORDER BY date_posted DESC"
-        cursor.execute(query, params)
-        jobs = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        return query, params
+    
+    def get_all_jobs(self, filters: Optional[Dict] = None) -> List[Dict]:
+        """
+        Retrieve jobs with optional filters applied.
+        
+        Args:
+            filters: Optional dictionary of filters (e.g., {'job_type': 'Remote'}).
         
-        return jobs
+        Returns:
+            List of job dictionaries.
+        """
+        return [job for chunk in self.iter_jobs(filters) for job in chunk]
+    
+    def iter_jobs(self, filters: Optional[Dict] = None, chunk_size: int = 500) -> Iterator[List[Dict]]:
+        """
+        Stream jobs in chunks instead of materializing the whole result set.
+        
+        Args:
+            filters: Optional dictionary of filters (e.g., {'job_type': 'Remote'}).
+            chunk_size: Number of rows fetched from SQLite per chunk.
+        
+        Yields:
+            Lists of up to chunk_size job dictionaries.
+        """
+        return iter_jobs(filters, chunk_size, self.db_path)
+    
+    def get_jobs_dataframe(self, filters: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Retrieve jobs as a DataFrame for bulk display, export, or analysis.
+        Rows are read straight into Arrow-backed columns by pandas instead of building one dict
+        per row, so the frame hands off to Arrow consumers without another conversion.
+        
+        Args:
+            filters: Optional dictionary of filters (e.g., {'job_type': 'Remote'}).
+        
+        Returns:
+            DataFrame with one row per job and created_at parsed as datetime.
+        """
+        query, params = self._build_jobs_query(filters)
+        with borrow_conn(self.db_path, read_only=True) as conn:
+            return pd.read_sql_query(
+                query, conn, params=params, parse_dates=["created_at"], dtype_backend="pyarrow"
+            )
     
     def get_job_count(self) -> int:
         """Get the total count of jobs in the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM newjobdb")
-        count = cursor.fetchone()[0]
-        conn.close()
-        return count
+        with borrow_conn(self.db_path, read_only=True) as conn:
+            return conn.execute("SELECT COUNT(*) FROM newjobdb").fetchone()[0]
+
+def ensure_schema(db_path: str = DATABASE_PATH):
+    """
+    Create or migrate the schema on a short-lived writer connection, closed before returning.
+    Idempotent, so processes that otherwise only read (the dashboard) can run it once at
+    startup instead of keeping a writer open.
+    
+    Args:
+        db_path: Database file to prepare.
+    """
+    JobDatabase(db_path).close()
 
 # Dashboard-specific database helpers
 # These functions provide aggregated data for the web dashboard.
-# For scalability: These can be cached (e.g., Redis) or computed asynchronously to handle concurrent requests.
+# Results are memoized in-process for DASHBOARD_CACHE_TTL seconds, since every page load and
+# filter change hits several of them while the data only changes between aggregation runs.
+# For scalability: The in-process cache can be swapped for a shared one (e.g., Redis) across workers.
+
+_CACHED_HELPERS: List[Callable] = []
+
+# PRAGMA data_version changes whenever another connection commits, including the aggregator's
+# writer in its own process. Values are only comparable on one connection, so each database
+# gets a dedicated one rather than whichever pooled connection is free.
+_VERSION_CONNS: Dict[str, sqlite3.Connection] = {}
+_VERSION_LOCK = threading.Lock()
 
-def get_db_connection():
+def data_version(db_path: str = DATABASE_PATH) -> int:
     """
-    Create a database connection with row factory enabled.
+    Read the database's change counter; cached results from an older version are stale.
+    
+    Args:
+        db_path: Database file to check.
     
     Returns:
-        SQLite connection object.
+        Value of PRAGMA data_version on this process's version connection.
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    with _VERSION_LOCK:
+        conn = _VERSION_CONNS.get(db_path)
+        if conn is None:
+            conn = _VERSION_CONNS[db_path] = open_connection(db_path, read_only=True)
+        return conn.execute("PRAGMA data_version").fetchone()[0]
+
+def ttl_cache(ttl: int = DASHBOARD_CACHE_TTL, maxsize: int = 256) -> Callable:
+    """
+    Memoize a read-only helper per argument tuple for ttl seconds, or until any connection
+    commits to the database (see data_version()).
+    Dict arguments (e.g. filters) are frozen into sorted item tuples to make them hashable.
+    The cache is guarded by a lock since Flask serves requests from several threads.
+    
+    Args:
+        ttl: Seconds a cached result stays valid.
+        maxsize: Maximum number of cached argument tuples; the oldest is evicted first.
+    
+    Returns:
+        Decorator adding the cache and a cache_clear() method to the function.
+    """
+    def decorator(func: Callable) -> Callable:
+        cache: Dict = {}
+        lock = threading.Lock()
+        
+        @functools.wraps(func)
+        def wrapper(*args):
+            key = tuple(tuple(sorted(a.items())) if isinstance(a, dict) else a for a in args)
+            now = time.monotonic()
+            version = data_version()
+            
+            with lock:
+                hit = cache.get(key)
+            if hit is not None and now - hit[0] < ttl and hit[1] == version:
+                return hit[2]
+            
+            value = func(*args)
+            with lock:
+                cache.pop(key, None)
+                if len(cache) >= maxsize:
+                    cache.pop(next(iter(cache)))
+                cache[key] = (now, version, value)
+            return value
+        
+        def cache_clear():
+            with lock:
+                cache.clear()
+        
+        wrapper.cache_clear = cache_clear
+        _CACHED_HELPERS.append(wrapper)
+        return wrapper
+    
+    return decorator
 
+def clear_dashboard_cache():
+    """Drop every memoized dashboard result so the next request reads fresh data."""
+    for helper in _CACHED_HELPERS:
+        helper.cache_clear()
+
+@ttl_cache()
 def get_statistics() -> Dict:
     """
     Retrieve key dashboard statistics (total jobs, remote, etc.).
@@ -158,86 +687,221 @@ def get_statistics() -> Dict:
     Returns:
         Dictionary of statistics.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with borrow_conn(read_only=True) as conn:
+        cursor = conn.cursor()
+        
+        today = datetime.now().date()
+        seven_days_ago = (datetime.now() - timedelta(days=7)).isoformat()
+        
+        # All counters in one pass over the table using conditional aggregation
+        cursor.execute("""
+            SELECT
+                COUNT(*) as total,
+                COALESCE(SUM(job_type LIKE '%remote%'), 0) as remote,
+                COALESCE(SUM(date_posted >= ? AND date_posted < ?), 0) as today,
+                COALESCE(SUM(date_posted >= ?), 0) as last_week,
+                COUNT(DISTINCT company_name) as companies
+            FROM newjobdb
+        """, (today.isoformat(), (today + timedelta(days=1)).isoformat(), seven_days_ago))
+        row = cursor.fetchone()
+        
+        return {
+            'total_jobs': row['total'],
+            'remote_jobs': row['remote'],
+            'jobs_today': row['today'],
+            'jobs_last_week': row['last_week'],
+            'top_companies': row['companies']
+        }
+
+@ttl_cache()
+def get_chart_data() -> Dict:
+    """
+    Retrieve data for dashboard charts (job types, sources).
+    Rows come back already shaped as label/value pairs for the chart widgets.
+    
+    Returns:
+        Dictionary with chart datasets.
+    """
+    with borrow_conn(read_only=True) as conn:
+        cursor = conn.cursor()
+        
+        # Job type distribution, counted straight off the job_type_bucket index
+        cursor.execute("""
+            SELECT job_type_bucket AS label, COUNT(*) AS value
+            FROM newjobdb
+            GROUP BY job_type_bucket
+        """)
+        job_types = [dict(row) for row in cursor.fetchall()]
+        
+        # Jobs by source
+        cursor.execute("""
+            SELECT source AS label, COUNT(*) AS value
+            FROM newjobdb
+            GROUP BY source
+            ORDER BY value DESC
+            LIMIT 5
+        """)
+        sources = [dict(row) for row in cursor.fetchall()]
+        
+        return {
+            'job_types': job_types,
+            'sources': sources
+        }
+
+def iter_jobs(filters: Optional[Dict] = None, chunk_size: int = 500,
+              db_path: str = DATABASE_PATH) -> Iterator[List[Dict]]:
+    """
+    Stream jobs in chunks over a pooled read-only connection, so readers such as the dashboard
+    export never need a JobDatabase (and its writer connection and schema setup).
+    Rows are fetched as plain tuples and zipped with the column names once per row,
+    skipping the intermediate sqlite3.Row objects.
     
-    # Total jobs
-    cursor.execute("SELECT COUNT(*) as total FROM newjobdb")
-    total_jobs = cursor.fetchone()['total']
+    Args:
+        filters: Optional dictionary of filters (e.g., {'job_type': 'Remote'}).
+        chunk_size: Number of rows fetched from SQLite per chunk.
+        db_path: Database file to read.
     
-    # Remote jobs
-    cursor.execute("SELECT COUNT(*) as remote FROM newjobdb WHERE job_type LIKE '%remote%'")
-    remote_jobs = cursor.fetchone()['remote']
+    Yields:
+        Lists of up to chunk_size job dictionaries.
+    """
+    query, params = JobDatabase._build_jobs_query(filters)
+    with borrow_conn(db_path, read_only=True) as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(query, params)
+        columns = [col[0] for col in cursor.description]
+        
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [dict(zip(columns, row)) for row in rows]
+
+def encode_cursor(job: Dict) -> str:
+    """
+    Encode the sort key of a job row as an opaque pagination cursor.
     
-    # Jobs posted today
-    today = datetime.now().date().isoformat()
-    cursor.execute("SELECT COUNT(*) as today FROM newjobdb WHERE date(date_posted) = ?", (today,))
-    jobs_today = cursor.fetchone()['today']
+    Args:
+        job: Last job dictionary of a page.
     
-    # Jobs in last 7 days
-    seven_days_ago = (datetime.now() - timedelta(days=7)).isoformat()
-    cursor.execute("SELECT COUNT(*) as last_week FROM newjobdb WHERE date_posted >= ?", (seven_days_ago,))
-    jobs_last_week = cursor.fetchone()['last_week']
+    Returns:
+        URL-safe base64 cursor string.
+    """
+    key = json.dumps([job['date_posted'], job['id']], separators=(',', ':'))
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+def decode_cursor(cursor: str) -> Optional[List]:
+    """
+    Decode a pagination cursor produced by encode_cursor.
     
-    # Top companies count
-    cursor.execute("SELECT COUNT(DISTINCT company_name) as companies FROM newjobdb")
-    top_companies = cursor.fetchone()['companies']
+    Args:
+        cursor: Cursor string from a previous page.
     
-    conn.close()
+    Returns:
+        [date_posted, id] list, or None if the cursor is malformed.
+    """
+    try:
+        date_posted, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return [str(date_posted), int(job_id)]
+    except (ValueError, TypeError):
+        return None
+
+@functools.lru_cache(maxsize=128)
+def fts_query(term: str) -> str:
+    """
+    Turn free-text user input into a safe FTS5 MATCH expression.
+    Each word becomes a quoted prefix term and all words must match, so FTS5 operators
+    and punctuation in the input are never interpreted.
     
-    return {
-        'total_jobs': total_jobs,
-        'remote_jobs': remote_jobs,
-        'jobs_today': jobs_today,
-        'jobs_last_week': jobs_last_week,
-        'top_companies': top_companies
-    }
+    Args:
+        term: Raw search box input.
+    
+    Returns:
+        MATCH expression, or an empty string if the input has no searchable words.
+    """
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', term))
 
-def get_chart_data() -> Dict:
+def like_prefix(term: str) -> str:
     """
-    Retrieve data for dashboard charts (job types, sources).
+    Build a LIKE pattern matching values that start with term, escaping LIKE wildcards in it.
+    
+    Args:
+        term: Raw filter input.
     
     Returns:
-        Dictionary with chart datasets.
+        Pattern for use with ESCAPE '\\'.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Job type distribution
-    cursor.execute("""
-        SELECT 
-            CASE 
-                WHEN job_type LIKE '%remote%' THEN 'Remote'
-                WHEN job_type LIKE '%hybrid%' THEN 'Hybrid'
-                WHEN job_type LIKE '%on-site%' OR job_type LIKE '%onsite%' THEN 'On-site'
-                ELSE 'Not Specified'
-            END as type,
-            COUNT(*) as count
-        FROM newjobdb
-        GROUP BY type
-    """)
-    job_types = cursor.fetchall()
-    
-    # Jobs by source
-    cursor.execute("""
-        SELECT source, COUNT(*) as count
-        FROM newjobdb
-        GROUP BY source
-        ORDER BY count DESC
-        LIMIT 5
-    """)
-    sources = cursor.fetchall()
-    
-    conn.close()
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"{escaped}%"
+
+# Columns the job list renders; the full description stays in the database and only a snippet
+# for the card preview is sent
+LIST_COLUMNS = (
+    "id, post_id, role, company_name, location, job_type, job_type_bucket, experience_required, "
+    "application_link, source, date_posted, created_at, substr(description, 1, 200) AS description_snippet"
+)
+
+@functools.lru_cache(maxsize=128)
+def _filtered_jobs_sql(search: str, date_range: str, job_type: bool, location: bool, company: bool,
+                       source: bool, experience: bool, keyset: bool, detail: bool = False) -> tuple:
+    """
+    Build the page and count SQL for one combination of active filters.
+    Every request with the same filter shape gets the identical SQL text, so the string is
+    assembled once and SQLite reuses the prepared statement from each connection's cache.
     
-    return {
-        'job_types': [{'label': row['type'], 'value': row['count']} for row in job_types],
-        'sources': [{'label': row['source'], 'value': row['count']} for row in sources]
-    }
+    Args:
+        search: 'fts' for a full-text match, 'like' for a substring match, '' for no search.
+        date_range..experience: Whether each filter is active (date_range is the range kind or '').
+        keyset: Whether the page continues after a cursor instead of using OFFSET.
+        detail: Select every column instead of the LIST_COLUMNS projection.
+    
+    Returns:
+        Tuple of (page query, count query).
+    """
+    where = "FROM newjobdb WHERE 1=1"
+    
+    # Search filter: an FTS5 index probe; input without words falls back to a substring scan
+    if search == 'fts':
+        where += " AND id IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)"
+    elif search == 'like':
+        where += " AND (role LIKE ? OR company_name LIKE ? OR description LIKE ?)"
+    
+    # Date range filter
+    if date_range == 'today':
+        # Half-open range instead of date(date_posted) so the date_posted index is usable
+        where += " AND date_posted >= ? AND date_posted < ?"
+    elif date_range in ('3days', '7days'):
+        where += " AND date_posted >= ?"
+    
+    # Job type, location, company, source and experience filters
+    if job_type:
+        where += " AND job_type LIKE ?"
+    if location:
+        where += " AND location LIKE ?"
+    if company:
+        where += " AND company_name LIKE ? ESCAPE '\\'"
+    if source:
+        where += " AND source = ?"
+    if experience:
+        where += " AND experience_required LIKE ?"
+    
+    count_query = f"SELECT COUNT(*) AS total {where}"
+    
+    # The window count rides along with the page, so the filter runs once instead of twice
+    columns = "*" if detail else LIST_COLUMNS
+    page_query = f"SELECT {columns}, COUNT(*) OVER() AS _total {where}"
+    if keyset:
+        page_query += " AND (date_posted, id) < (?, ?) ORDER BY date_posted DESC, id DESC LIMIT ?"
+    else:
+        page_query += " ORDER BY date_posted DESC, id DESC LIMIT ? OFFSET ?"
+    
+    return page_query, count_query
 
+@ttl_cache()
 def get_filtered_jobs(filters: Dict) -> Dict:
     """
     Retrieve filtered and paginated jobs for the dashboard.
+    Rows use the LIST_COLUMNS projection unless filters['fields'] is 'detail'.
     
     Args:
         filters: Dictionary of filter parameters.
@@ -245,84 +909,96 @@ def get_filtered_jobs(filters: Dict) -> Dict:
     Returns:
         Dictionary with jobs list, pagination info.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    query = "SELECT * FROM newjobdb WHERE 1=1"
     params = []
     
-    # Search filter
+    search = ''
     if filters.get('search'):
-        query += " AND (role LIKE ? OR company_name LIKE ? OR description LIKE ?)"
-        search_term = f"%{filters['search']}%"
-        params.extend([search_term, search_term, search_term])
+        match = fts_query(filters['search'])
+        if match:
+            search = 'fts'
+            params.append(match)
+        else:
+            search = 'like'
+            search_term = f"%{filters['search']}%"
+            params.extend([search_term, search_term, search_term])
     
-    # Date range filter
-    if filters.get('date_range'):
-        if filters['date_range'] == 'today':
-            today = datetime.now().date().isoformat()
-            query += " AND date(date_posted) = ?"
-            params.append(today)
-        elif filters['date_range'] == '3days':
-            three_days_ago = (datetime.now() - timedelta(days=3)).isoformat()
-            query += " AND date_posted >= ?"
-            params.append(three_days_ago)
-        elif filters['date_range'] == '7days':
-            seven_days_ago = (datetime.now() - timedelta(days=7)).isoformat()
-            query += " AND date_posted >= ?"
-            params.append(seven_days_ago)
-    
-    # Job type filter
-    if filters.get('job_type') and filters['job_type'] != 'all':
-        query += " AND job_type LIKE ?"
+    date_range = filters.get('date_range') or ''
+    if date_range == 'today':
+        today = datetime.now().date()
+        params.extend([today.isoformat(), (today + timedelta(days=1)).isoformat()])
+    elif date_range == '3days':
+        params.append((datetime.now() - timedelta(days=3)).isoformat())
+    elif date_range == '7days':
+        params.append((datetime.now() - timedelta(days=7)).isoformat())
+    
+    job_type = bool(filters.get('job_type')) and filters['job_type'] != 'all'
+    if job_type:
         params.append(f"%{filters['job_type']}%")
     
-    # Location filter
-    if filters.get('location'):
-        query += " AND location LIKE ?"
+    location = bool(filters.get('location'))
+    if location:
         params.append(f"%{filters['location']}%")
     
-    # Company filter
-    if filters.get('company'):
-        query += " AND company_name LIKE ?"
-        params.append(f"%{filters['company']}%")
+    # Company names are typed from their start, so match a prefix the NOCASE index can seek
+    company = bool(filters.get('company'))
+    if company:
+        params.append(like_prefix(filters['company']))
     
-    # Source filter
-    if filters.get('source') and filters['source'] != 'all':
-        query += " AND source = ?"
+    source = bool(filters.get('source')) and filters['source'] != 'all'
+    if source:
         params.append(filters['source'])
     
-    # Experience filter
-    if filters.get('experience') and filters['experience'] != 'all':
-        query += " AND experience_required LIKE ?"
+    experience = bool(filters.get('experience')) and filters['experience'] != 'all'
+    if experience:
         params.append(f"%{filters['experience']}%")
     
-    query += " ORDER BY date_posted DESC"
-    
-    # Get total count before pagination
-    count_query = query.replace('SELECT *', 'SELECT COUNT(*) as total')
-    cursor.execute(count_query, params)
-    total = cursor.fetchone()['total']
-    
-    # Pagination
+    # Pagination: a cursor continues after the last row of the previous page by seeking the
+    # (date_posted, id) index, so deep pages cost the same as the first; page falls back to OFFSET
     page = int(filters.get('page', 1))
     per_page = int(filters.get('per_page', 20))
-    offset = (page - 1) * per_page
-    query += f" LIMIT {per_page} OFFSET {offset}"
+    after = decode_cursor(filters['cursor']) if filters.get('cursor') else None
+    
+    query, count_query = _filtered_jobs_sql(
+        search, date_range, job_type, location, company, source, experience, bool(after),
+        filters.get('fields') == 'detail'
+    )
+    if after:
+        page_params = params + after + [per_page + 1]
+    else:
+        page_params = params + [per_page + 1, (page - 1) * per_page]
     
-    cursor.execute(query, params)
-    jobs = [dict(row) for row in cursor.fetchall()]
+    with borrow_conn(read_only=True) as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, page_params)
+        jobs = [dict(row) for row in cursor.fetchall()]
+        
+        if jobs:
+            total = jobs[0]['_total']
+            for job in jobs:
+                del job['_total']
+            if after:
+                # After a cursor the window only counts the remaining rows
+                total += (page - 1) * per_page
+        else:
+            # Past the last page there is no row to carry the total
+            cursor.execute(count_query, params)
+            total = cursor.fetchone()['total']
     
-    conn.close()
+    # The extra row only tells us whether another page exists
+    has_next = len(jobs) > per_page
+    jobs = jobs[:per_page]
     
     return {
         'jobs': jobs,
         'total': total,
         'page': page,
         'per_page': per_page,
-        'total_pages': (total + per_page - 1) // per_page
+        'total_pages': (total + per_page - 1) // per_page,
+        'has_next': has_next,
+        'next_cursor': encode_cursor(jobs[-1]) if has_next else None
     }
 
+@ttl_cache()
 def get_filter_options() -> Dict:
     """
     Retrieve available options for dashboard filters (sources, locations, companies).
@@ -330,25 +1006,23 @@ def get_filter_options() -> Dict:
     Returns:
         Dictionary of filter option lists.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Get unique sources
-    cursor.execute("SELECT DISTINCT source FROM newjobdb ORDER BY source")
-    sources = [row['source'] for row in cursor.fetchall()]
-    
-    # Get unique locations
-    cursor.execute("SELECT DISTINCT location FROM newjobdb WHERE location IS NOT NULL ORDER BY location LIMIT 20")
-    locations = [row['location'] for row in cursor.fetchall()]
-    
-    # Get unique companies
-    cursor.execute("SELECT DISTINCT company_name FROM newjobdb ORDER BY company_name LIMIT 50")
-    companies = [row['company_name'] for row in cursor.fetchall()]
-    
-    conn.close()
-    
-    return {
-        'sources': sources,
-        'locations': locations,
-        'companies': companies
-    }
\ No newline at end of file
+    with borrow_conn(read_only=True) as conn:
+        cursor = conn.cursor()
+        
+        # Get unique sources
+        cursor.execute("SELECT DISTINCT source FROM newjobdb ORDER BY source")
+        sources = [row['source'] for row in cursor.fetchall()]
+        
+        # Get unique locations
+        cursor.execute("SELECT DISTINCT location FROM newjobdb WHERE location IS NOT NULL ORDER BY location LIMIT 20")
+        locations = [row['location'] for row in cursor.fetchall()]
+        
+        # Get unique companies
+        cursor.execute("SELECT DISTINCT company_name FROM newjobdb ORDER BY company_name LIMIT 50")
+        companies = [row['company_name'] for row in cursor.fetchall()]
+        
+        return {
+            'sources': sources,
+            'locations': locations,
+            'companies': companies
+        }
\ No newline at end of file
@@ -1,50 +1,73 @@
 # extractors.py
 """
 HTML extraction module for the Job Aggregation Agent.
-Handles parsing of WhatsApp HTML using BeautifulSoup to extract messages and timestamps.
-For scalability: This module can be extended to support parallel extraction via multiprocessing
-or integrated with a message queue (e.g., RabbitMQ) for handling large volumes of HTML files asynchronously.
+Handles parsing of WhatsApp HTML using selectolax (lexbor) to extract messages and timestamps.
+For scalability: batches of saved HTML files are spread across worker processes via extract_many;
+the module can also be integrated with a message queue (e.g., RabbitMQ) for handling large volumes asynchronously.
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 
 from utils import try_parse_datetime, clean_pre_plain, parse_pre_plain
 
+# Message container selectors in order of preference; lexbor matches them all in one pass
+MESSAGE_SELECTOR = '[data-pre-plain-text]'
+LEGACY_MESSAGE_SELECTOR = '[data-pre_plain_text]'
+COPYABLE_TEXT_SELECTOR = '.copyable-text'
+CANDIDATE_SELECTOR = ', '.join((MESSAGE_SELECTOR, LEGACY_MESSAGE_SELECTOR, COPYABLE_TEXT_SELECTOR))
+
 class HTMLMessageExtractor:
     """
-    Extractor class for text and timestamps from WhatsApp HTML using BeautifulSoup.
-    Processes HTML tags to pull out message content and associated metadata.
+    Extractor class for text and timestamps from WhatsApp HTML using the lexbor HTML5 parser.
+    Processes HTML elements to pull out message content and associated metadata.
     """
     
     @staticmethod
-    def extract_from_tag(tag) -> Dict:
+    def build_message(pre: Optional[str], visible: str) -> Dict:
         """
-        Extract text and timestamp from a single message tag.
+        Build a message from a container's pre-plain attribute and its visible text.
         
         Args:
-            tag: BeautifulSoup tag element.
+            pre: data-pre-plain-text attribute value, or None.
+            visible: Container text, trimmed text nodes joined by single spaces.
         
         Returns:
             Dictionary with 'text' and 'timestamp' keys.
         """
-        pre = tag.get('data-pre-plain-text') or tag.get('data-pre_plain_text')
         parsed = parse_pre_plain(pre)
         
-        # Get visible text
-        visible = tag.get_text(separator=' ', strip=True) or ''
-        
         # Remove pre-plain visible part if present
         if parsed['raw']:
-            raw = parsed['raw'].strip()
-            if visible.startswith(raw):
-                visible = visible[len(raw):].strip()
+            visible = visible.removeprefix(parsed['raw'].strip()).strip()
         
         ts_iso = try_parse_datetime(parsed.get('ts_str'))
         timestamp_out = ts_iso or parsed.get('ts_str')
         
         return {'text': visible, 'timestamp': timestamp_out}
     
+    @staticmethod
+    def extract_from_tag(tag) -> Dict:
+        """
+        Extract text and timestamp from a single message tag.
+        
+        Args:
+            tag: selectolax lexbor node.
+        
+        Returns:
+            Dictionary with 'text' and 'timestamp' keys.
+        """
+        attrs = tag.attributes
+        pre = attrs.get('data-pre-plain-text') or attrs.get('data-pre_plain_text')
+        
+        # Get visible text
+        texts = (node.text_content.strip() for node in tag.traverse(include_text=True) if node.tag == '-text')
+        visible = ' '.join(s for s in texts if s)
+        
+        return HTMLMessageExtractor.build_message(pre, visible)
+    
     @staticmethod
     def extract_from_html(html_path: str) -> List[Dict]:
         """
@@ -58,17 +81,59 @@ class HTMLMessageExtractor:
         """
         try:
             with open(html_path, 'r', encoding='utf-8', errors='ignore') as f:
-                soup = BeautifulSoup(f.read(), 'lxml')
+                html = f.read()
         except Exception as e:
             print(f"   Error reading HTML: {e}")
             return []
         
-        # Try multiple selectors for message containers
-        elems = soup.find_all(attrs={'data-pre-plain-text': True})
+        return HTMLMessageExtractor.extract_from_string(html)
+    
+    @staticmethod
+    def extract_many(paths: List[str]) -> Dict[str, List[Dict]]:
+        """
+        Extract messages from several HTML files in parallel worker processes.
+        
+        Args:
+            paths: Paths to the HTML files.
+        
+        Returns:
+            Dictionary mapping each path to its list of message dictionaries.
+        """
+        if len(paths) < 2:
+            return {path: HTMLMessageExtractor.extract_from_html(path) for path in paths}
+        
+        workers = min(os.cpu_count() or 1, len(paths))
+        # Small batches go one file per task so every worker gets a share
+        chunksize = max(1, min(4, len(paths) // workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(HTMLMessageExtractor.extract_from_html, paths, chunksize=chunksize)
+            return dict(zip(paths, results))
+    
+    @staticmethod
+    def extract_from_string(html: str) -> List[Dict]:
+        """
+        Extract all messages from an HTML document held in memory.
+        
+        Args:
+            html: Raw HTML markup.
+        
+        Returns:
+            List of message dictionaries.
+        """
+        try:
+            tree = LexborHTMLParser(html)
+        except Exception as e:
+            print(f"   Error parsing HTML: {e}")
+            return []
+        
+        # Collect every candidate in one traversal, then keep the most specific kind present.
+        # Nodes matching more than one selector are reported once per match, so dedupe by node.
+        candidates = list({e.mem_id: e for e in tree.css(CANDIDATE_SELECTOR)}.values())
+        elems = [e for e in candidates if 'data-pre-plain-text' in e.attributes]
         if not elems:
-            elems = soup.find_all(attrs={'data-pre_plain_text': True})
+            elems = [e for e in candidates if 'data-pre_plain_text' in e.attributes]
         if not elems:
-            elems = soup.select('.copyable-text') or []
+            elems = [e for e in candidates if 'copyable-text' in (e.attributes.get('class') or '').split()]
         
         messages = []
         for elem in elems:
@@ -79,4 +144,26 @@ class HTMLMessageExtractor:
             except Exception:
                 continue
         
+        return messages
+    
+    @staticmethod
+    def extract_from_records(records: List[List[Optional[str]]]) -> List[Dict]:
+        """
+        Extract messages from [pre_plain, visible_text] pairs already collected inside the page.
+        
+        Args:
+            records: One [pre-plain attribute or None, visible text] pair per message container.
+        
+        Returns:
+            List of message dictionaries.
+        """
+        messages = []
+        for pre, visible in records:
+            try:
+                msg = HTMLMessageExtractor.build_message(pre, visible or '')
+                if msg['text'] and msg['timestamp']:  # Only keep if both exist
+                    messages.append(msg)
+            except Exception:
+                continue
+        
         return messages
\ No newline at end of file
@@ -1,7 +1,7 @@
 # master.py
 """
 Scalable Intelligent Job Aggregation Agent (v2)
-Improved pipeline: HTML scraping → BeautifulSoup extraction → LLM parsing
+Improved pipeline: in-page message scraping → timestamp extraction → LLM parsing
 
 This is the main entry point and orchestrator for the job aggregation system.
 It coordinates sources, parsing, and database operations without altering existing functionality.
@@ -9,17 +9,44 @@ For scalability: The JobAggregator class uses dependency injection for sources a
 enabling easy extension to multiple workers (e.g., via Celery) or distributed execution across nodes.
 """
 
-import hashlib
+import argparse
+import asyncio
 import json
-import requests
+import re
 import time
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from config import CHANNELS, OLLAMA_URL, OLLAMA_MODEL, DATABASE_PATH, CHROME_DRIVER_PATH, CHROME_PROFILE_DIR
+from config import (
+    ENABLED_WHATSAPP_CHANNELS, OLLAMA_URL, OLLAMA_MODEL, DATABASE_PATH, CHROME_PROFILE_DIR,
+    PARSE_BATCH_SIZE, PARSE_POLL_SECONDS,
+)
 from models import JobPost
-from adapters import WhatsAppChannelAdapter, SourceAdapter
+from adapters import WhatsAppBrowserSession, WhatsAppChannelAdapter, SourceAdapter, fetch_all
 from parser import OllamaJobParser
 from database import JobDatabase
+from utils import make_post_id
+
+# Cheap gate run before the LLM: a posting names the job and says how to apply, and needs a few
+# words for the role, company and one more detail (the prompt rejects shorter messages anyway)
+_MIN_JOB_WORDS = 5
+_JOB_HINT_RE = re.compile(
+    r"\b(hiring|role|position|apply|experience|years?|yrs?|ctc|salary|lpa|intern|fresher|openings?|vacanc(?:y|ies)"
+    r"|developer|engineer|remote|hybrid|on-?site)\b", re.I
+)
+_CONTACT_RE = re.compile(r"https?://|www\.|@|\+?\d[\d\s-]{8,}\d")
+
+def looks_like_job(text: str) -> bool:
+    """
+    Check whether a message could be a job posting before spending an LLM call on it.
+    
+    Args:
+        text: Raw message text.
+    
+    Returns:
+        True if the text has enough words, a job keyword and a link, email address or phone number.
+    """
+    return bool(text and _JOB_HINT_RE.search(text) and _CONTACT_RE.search(text)
+                and len(text.split()) >= _MIN_JOB_WORDS)
 
 class JobAggregator:
     """
@@ -36,14 +63,22 @@ class JobAggregator:
             ollama_url: URL for the Ollama service.
         """
         self.db = JobDatabase(db_path)
-        self.parser = OllamaJobParser(model_name=OLLAMA_MODEL, ollama_url=ollama_url)
+        self.parser = OllamaJobParser(model_name=OLLAMA_MODEL, ollama_url=ollama_url, cache=self.db)
         self.sources: List[SourceAdapter] = []
+        # Kept for the aggregator's lifetime so the shared browser survives between runs
+        self.loop = asyncio.new_event_loop()
+    
+    def close(self):
+        """Close the parser's HTTP session and the database connection."""
+        self.loop.run_until_complete(self.parser.aclose())
+        self.db.close()
     
     def add_source(self, source: SourceAdapter):
         """Register a data source adapter."""
         self.sources.append(source)
     
-    def process_post(self, text: str, timestamp: str, source_name: str) -> Optional[JobPost]:
+    def process_post(self, text: str, timestamp: str, source_name: str,
+                     extracted_at: Optional[str] = None) -> Optional[JobPost]:
         """
         Convert a raw message to a structured JobPost using the LLM parser.
         
@@ -51,24 +86,40 @@ class JobAggregator:
             text: Raw message text.
             timestamp: Message timestamp.
             source_name: Name of the source.
+            extracted_at: Extraction time in ISO format; defaults to now.
         
         Returns:
             JobPost if valid, else None.
         """
+        if not looks_like_job(text):
+            return None
         
         parsed_data = self.parser.parse_job_post(text, timestamp, source_name)
+        return self.build_job(parsed_data, timestamp, source_name, extracted_at)
+    
+    def build_job(self, parsed_data: Optional[Dict], timestamp: str, source_name: str,
+                  extracted_at: Optional[str] = None) -> Optional[JobPost]:
+        """
+        Turn the parser's output for one message into a JobPost.
         
+        Args:
+            parsed_data: Dictionary returned by the LLM parser, or None.
+            timestamp: Message timestamp.
+            source_name: Name of the source.
+            extracted_at: Extraction time in ISO format; defaults to now.
+        
+        Returns:
+            JobPost if valid, else None.
+        """
         if not parsed_data or not parsed_data.get('valid'):
             return None
         
-        # Generate unique post_id using hash for deduplication
-        post_hash = hashlib.md5(
-            f"{parsed_data.get('company_name')}{parsed_data.get('role')}{timestamp}".encode()
-        ).hexdigest()
+        role = str(parsed_data.get("role", "Unknown")).strip()
+        company_name = str(parsed_data.get("company_name", "Unknown")).strip()
         
         job = JobPost(
-            role=str(parsed_data.get("role", "Unknown")).strip(),
-            company_name=str(parsed_data.get("company_name", "Unknown")).strip(),
+            role=role,
+            company_name=company_name,
             location=str(parsed_data.get("location", "Not specified")).strip(),
             experience_required=parsed_data.get("experience_required"),
             job_type=parsed_data.get("job_type"),
@@ -76,66 +127,189 @@ class JobAggregator:
             description=parsed_data.get("description"),
             source=source_name,
             date_posted=timestamp,
-            extracted_at=time.strftime('%Y-%m-%dT%H:%M:%S'),  # Use current time in ISO format
-            post_id=post_hash
+            extracted_at=extracted_at or time.strftime('%Y-%m-%dT%H:%M:%S'),  # Current time in ISO format
+            # Unique post_id from the stored fields for deduplication
+            post_id=make_post_id(company_name, role, timestamp)
         )
         
         return job
     
-    def aggregate(self):
+    def flush_jobs(self, pending: List[JobPost]) -> int:
         """
-        Execute the main aggregation pipeline across all sources.
-        Processes messages, parses jobs, and inserts into database.
+        Write buffered jobs to the database in one transaction and empty the buffer.
+        
+        Args:
+            pending: Parsed jobs waiting to be inserted; cleared in place.
         
         Returns:
-            Count of new jobs added.
+            Number of new jobs inserted.
         """
-        print("\n" + "="*70)
-        print("STARTING JOB AGGREGATION")
-        print("="*70)
+        if not pending:
+            return 0
         
-        new_jobs_count = 0
-        total_messages_processed = 0
+        inserted = self.db.insert_jobs(pending)
+        duplicates = len(pending) - inserted
+        print(f"    Saved {inserted} new jobs" + (f" ({duplicates} duplicate entries skipped)" if duplicates else ""))
+        pending.clear()
+        return inserted
+    
+    def ingest(self) -> int:
+        """
+        Scrape every source and queue the messages for parsing.
+        Messages queued on an earlier run are ignored, so only new ones are parsed.
+        
+        Returns:
+            Number of newly queued messages.
+        """
+        # Scrape every source concurrently
+        all_messages = self.loop.run_until_complete(fetch_all(self.sources))
+        # Every message of this run was extracted during the scrape above
+        extracted_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        
+        total_queued = 0
+        for source, messages in zip(self.sources, all_messages):
+            queued = self.db.queue_raw_posts(source.source_name, messages, extracted_at)
+            total_queued += queued
+            print(f"{source.source_name}: {len(messages)} messages scraped, {queued} new queued for parsing")
+        
+        return total_queued
+    
+    def parse_pending(self, batch_size: int = PARSE_BATCH_SIZE) -> Tuple[int, int, int]:
+        """
+        Drain the raw post queue: gate, parse and store jobs one batch at a time.
+        Each batch's jobs are saved before its posts are marked parsed, so an interrupted run
+        loses nothing; failed requests are left for the next run.
+        
+        Args:
+            batch_size: Raw posts claimed per batch.
+        
+        Returns:
+            Tuple of (posts processed, valid jobs found, new jobs added).
+        """
+        total_processed = 0
         total_valid_jobs = 0
+        new_jobs_count = 0
         
-        for source in self.sources:
+        while True:
+            # Checked here rather than at startup, so scraping never waits on it; while Ollama is
+            # down the queue is left pending instead of every post failing
+            if not self.parser.ensure_alive():
+                print("Queued messages are left for the next run")
+                break
+            posts = self.db.claim_raw_posts(batch_size)
+            if not posts:
+                break
+            
+            total_processed += len(posts)
             print(f"\n{'─'*70}")
-            print(f"Processing source: {source.source_name}")
+            print(f"Parsing {len(posts)} queued messages")
             print(f"{'─'*70}")
             
-            messages = source.fetch_posts()
-            print(f"\nFound {len(messages)} messages to process\n")
+            candidates = []
+            skipped = []
+            for post in posts:
+                if looks_like_job(post['text']):
+                    candidates.append(post)
+                else:
+                    skipped.append(post['post_hash'])
+            if skipped:
+                print(f"Skipped {len(skipped)} messages with no job keywords or contact details")
             
-            for idx, msg in enumerate(messages, 1):
-                total_messages_processed += 1
-                text = msg.get('text', '')
-                timestamp = msg.get('timestamp', '')
-                
-                print(f"[{idx}/{len(messages)}] Processing: {text[:60]}...")
+            # Parse the candidates with concurrent LLM requests, then build jobs in queue order
+            results = self.loop.run_until_complete(self.parser.parse_batch_results(candidates))
+            
+            jobs: List[JobPost] = []
+            parsed_hashes, failed_hashes = [], []
+            # Collected and printed in one write per batch
+            summary = []
+            for post, (parsed_data, settled) in zip(candidates, results):
+                (parsed_hashes if settled else failed_hashes).append(post['post_hash'])
+                timestamp = post['timestamp'] or ''
                 
-                job = self.process_post(text, timestamp, source.source_name)
+                job = self.build_job(parsed_data, timestamp, post['source'], post['extracted_at'])
                 
                 if job:
                     total_valid_jobs += 1
-                    if self.db.insert_job(job):
-                        new_jobs_count += 1
-                        print(f"    Added: {job.role} at {job.company_name}")
-                        print(f"       Location: {job.location} | Posted: {timestamp[:10]}")
-                    else:
-                        print(f"    Duplicate entry")
+                    jobs.append(job)
+                    summary.append(f"    Parsed: {job.role} at {job.company_name}")
+                    summary.append(f"       Location: {job.location} | Posted: {timestamp[:10]}")
+            if summary:
+                print("\n".join(summary))
+            
+            new_jobs_count += self.flush_jobs(jobs)
+            # If Ollama went away mid-batch, the failures go back to the queue for the next successful
+            # check (the loop stops there) instead of waiting for a restart as 'failed'
+            failed_status = 'failed' if self.parser.alive else 'pending'
+            self.db.mark_raw_posts({'skipped': skipped, 'parsed': parsed_hashes, failed_status: failed_hashes})
+            if failed_hashes and failed_status == 'pending':
+                print(f"    Lost the Ollama connection; {len(failed_hashes)} messages returned to the queue")
+            elif failed_hashes:
+                print(f"    {len(failed_hashes)} messages failed and will be retried next run")
+        
+        return total_processed, total_valid_jobs, new_jobs_count
+    
+    def aggregate(self):
+        """
+        Execute the main aggregation pipeline across all sources:
+        scrape into the raw post queue, then parse the queue into jobs.
+        
+        Returns:
+            Count of new jobs added.
+        """
+        print("\n" + "="*70)
+        print("STARTING JOB AGGREGATION")
+        print("="*70)
+        
+        total_queued = self.ingest()
+        requeued = self.db.requeue_raw_posts()
+        if requeued:
+            print(f"Retrying {requeued} messages from earlier runs")
+        total_messages_processed, total_valid_jobs, new_jobs_count = self.parse_pending()
+        
+        duplicates_found = self.db.find_duplicates()
         
         # Summary
         print(f"\n{'='*70}")
         print("AGGREGATION SUMMARY")
         print(f"{'='*70}")
+        print(f"New messages queued: {total_queued}")
         print(f"Total messages processed: {total_messages_processed}")
         print(f"Valid job postings found: {total_valid_jobs}")
         print(f"New jobs added: {new_jobs_count}")
+        print(f"New duplicates flagged: {duplicates_found}")
         print(f"Total jobs in database: {self.db.get_job_count()}")
         print(f"{'='*70}\n")
         
         return new_jobs_count
 
+class JobParserWorker:
+    """
+    Background parser that keeps draining the raw post queue, so scraping (via --scrape-only)
+    never waits on the LLM. Only one parser should drain a database at a time.
+    """
+    
+    def __init__(self, aggregator: JobAggregator, poll_interval: float = PARSE_POLL_SECONDS):
+        self.aggregator = aggregator
+        self.poll_interval = poll_interval
+    
+    def run(self):
+        """Parse queued posts until interrupted, sleeping while the queue is empty."""
+        db = self.aggregator.db
+        requeued = db.requeue_raw_posts()
+        print(f"Parser worker started ({requeued} messages requeued), polling every {self.poll_interval}s")
+        
+        try:
+            while True:
+                processed, _, new_jobs = self.aggregator.parse_pending()
+                if new_jobs:
+                    db.find_duplicates()
+                if processed:
+                    print(f"Processed {processed} messages, {new_jobs} new jobs")
+                else:
+                    time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            print("Parser worker stopped")
+
 def initialize_aggregator() -> JobAggregator:
     """
     Set up the aggregator instance with configured sources.
@@ -144,31 +318,34 @@ def initialize_aggregator() -> JobAggregator:
         Initialized JobAggregator.
     """
     aggregator = JobAggregator(DATABASE_PATH)
+    # One browser session for every channel and every run: Chrome starts and the login is checked once
+    session = WhatsAppBrowserSession(CHROME_PROFILE_DIR)
     
-    for channel in CHANNELS["WhatsApp"]:
-        if channel["enabled"]:
-            adapter = WhatsAppChannelAdapter(
-                channel_url=channel["url"],
-                source_name=channel["name"],
-                chrome_driver_path=CHROME_DRIVER_PATH,
-                user_data_dir=CHROME_PROFILE_DIR
-            )
-            aggregator.add_source(adapter)
+    for channel in ENABLED_WHATSAPP_CHANNELS:
+        adapter = WhatsAppChannelAdapter(
+            channel_url=channel["url"],
+            source_name=channel["name"],
+            user_data_dir=CHROME_PROFILE_DIR,
+            session=session
+        )
+        aggregator.add_source(adapter)
     
     return aggregator
 
 if __name__ == "__main__":
-    print(f"\nChecking Ollama connection ({OLLAMA_MODEL})...")
-    try:
-        response = requests.get(f"{OLLAMA_URL}/api/tags", timeout=5)
-        if response.status_code == 200:
-            print("Ollama server is running!")
-        else:
-            print(f"Ollama returned status {response.status_code}")
-            exit(1)
-    except requests.exceptions.ConnectionError:
-        print("Cannot connect to Ollama. Start it with: ollama serve")
-        exit(1)
+    cli = argparse.ArgumentParser(description="Scrape job channels and parse postings into the database.")
+    mode = cli.add_mutually_exclusive_group()
+    mode.add_argument("--scrape-only", action="store_true", help="scrape and queue messages without parsing")
+    mode.add_argument("--worker", action="store_true", help="keep parsing queued messages in the background")
+    args = cli.parse_args()
     
     aggregator = initialize_aggregator()
-    aggregator.aggregate()
\ No newline at end of file
+    try:
+        if args.scrape_only:
+            print(f"Queued {aggregator.ingest()} new messages")
+        elif args.worker:
+            JobParserWorker(aggregator).run()
+        else:
+            aggregator.aggregate()
+    finally:
+        aggregator.close()
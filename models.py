@@ -6,14 +6,17 @@ For scalability: These dataclasses can be extended to include additional fields
 or serialized to different formats (JSON, Protobuf) for microservices communication.
 """
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Optional
 
-@dataclass
+import orjson
+
+@dataclass(slots=True, frozen=True)
 class JobPost:
     """
     Standardized job post template.
     Represents a parsed job posting with essential fields for storage and display.
+    Slotted (no per-instance __dict__) and immutable, so instances are small and hashable.
     """
     role: str
     company_name: str
@@ -28,5 +31,13 @@ class JobPost:
     post_id: str
     
     def to_dict(self):
-        """Convert the dataclass to a dictionary for serialization."""
-        return asdict(self)
\ No newline at end of file
+        """
+        Convert the dataclass to a dictionary for serialization.
+        Every field is a flat string, so reading the slots is enough; asdict would deep-copy
+        each value.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    def to_json(self) -> bytes:
+        """Serialize the job to UTF-8 JSON bytes; orjson encodes dataclasses natively."""
+        return orjson.dumps(self)
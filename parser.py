@@ -6,11 +6,88 @@ For scalability: Parsing can be offloaded to a dedicated service (e.g., via gRPC
 for high-throughput processing in a microservices architecture, with rate limiting to handle API quotas.
 """
 
+import asyncio
 import json
+import textwrap
 import requests
-from typing import Optional, Dict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, List, Tuple
 
-from config import OLLAMA_URL, OLLAMA_MODEL
+import aiohttp
+import orjson
+
+from config import (OLLAMA_URL, OLLAMA_MODEL, OLLAMA_CONCURRENCY, OLLAMA_CONNECTION_LIMIT, OLLAMA_KEEP_ALIVE,
+                    OLLAMA_OPTIONS, OLLAMA_PROMPT_BATCH_SIZE)
+from database import JobDatabase
+from utils import make_text_hash
+
+STATUS_SUCCESS = "Success"
+STATUS_NOT_JOB = "(Not a job posting)"
+STATUS_UNREACHABLE = "(Ollama not running)"
+# Cached verdict for messages the model rejected
+NOT_A_JOB = {"valid": False}
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Retry policy for both HTTP clients: only failures where Ollama never generated anything
+# (refused connections, gateway errors) are retried; a read timeout is not, since the model may
+# still be working on the request
+_RETRIES = 2
+_RETRY_BACKOFF = 0.3
+_RETRY_STATUSES = (502, 503, 504)
+
+# Prompt pieces shared by the single-message and multi-message prompts
+_CRITERIA = """1. Text MUST contain a job title/role
+2. Text MUST contain a company name
+3. Text MUST contain at least one of: location, job type (remote/hybrid/on-site), experience level, salary
+4. Ignore single-word messages, vague terms, or non-job content
+5. Return ONLY valid JSON, no markdown or comments"""
+
+_JOB_FIELDS = """    "role": "Job title",
+    "company_name": "Company name",
+    "location": "Location or 'Not specified'",
+    "experience_required": "Years/Level or null",
+    "job_type": "Remote/On-site/Hybrid or null",
+    "application_link": "URL or contact email or null",
+    "description": "Brief summary (2-3 sentences)\""""
+_BATCH_JOB_FIELDS = textwrap.indent(_JOB_FIELDS, " " * 8)
+
+# Instructions go in the system message and never change between requests, so Ollama keeps their
+# KV cache and only evaluates the message text that follows them
+_SYSTEM_PROMPT = f"""You are a job posting analyzer. Analyze the text in the user message and determine if it is a valid job posting.
+
+RULES:
+{_CRITERIA}
+6. If this is NOT a valid job posting, return exactly: {{"valid": false}}
+
+If valid, return this JSON structure:
+{{
+    "valid": true,
+{_JOB_FIELDS}
+}}
+
+Respond ONLY with the JSON object, nothing else."""
+
+_BATCH_SYSTEM_PROMPT = f"""You are a job posting analyzer. Analyze each numbered message in the user message and determine if it is a valid job posting.
+
+RULES:
+{_CRITERIA}
+6. Return exactly one entry per message, in order, with "index" set to the message number
+7. For a message that is NOT a valid job posting, the entry is exactly: {{"index": n, "valid": false}}
+
+Return this JSON structure:
+{{
+    "results": [
+        {{
+            "index": 1,
+            "valid": true,
+{_BATCH_JOB_FIELDS}
+        }}
+    ]
+}}
+
+Respond ONLY with the JSON object, nothing else."""
 
 class OllamaJobParser:
     """
@@ -18,9 +95,254 @@ class OllamaJobParser:
     Analyzes text to extract structured job information, validating against criteria.
     """
     
-    def __init__(self, model_name: str = OLLAMA_MODEL, ollama_url: str = OLLAMA_URL):
+    def __init__(self, model_name: str = OLLAMA_MODEL, ollama_url: str = OLLAMA_URL,
+                 cache: Optional[JobDatabase] = None):
         self.model_name = model_name
         self.ollama_url = ollama_url
+        # Database holding the parse_cache table; without one every message goes to the model
+        self.cache = cache
+        # Keep-alive session so back-to-back parses reuse one connection to Ollama. A chat call
+        # has no side effects, so POSTs are retried when Ollama is briefly unavailable (e.g. busy
+        # loading the model behind a proxy)
+        self.session = requests.Session()
+        retries = Retry(total=_RETRIES, read=False, backoff_factor=_RETRY_BACKOFF,
+                        status_forcelist=_RETRY_STATUSES, allowed_methods=["POST"])
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retries)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # aiohttp session for concurrent parsing, kept open across batches run on the same event loop
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Set once Ollama has answered a health check and cleared again when a request cannot reach
+        # it, so the next ensure_alive() call checks again
+        self._alive = False
+    
+    @property
+    def alive(self) -> bool:
+        """True while Ollama is known to be reachable (no failed connection since the last check)."""
+        return self._alive
+    
+    def ensure_alive(self) -> bool:
+        """
+        Check that Ollama is reachable, hitting /api/tags only while it is not known to be up.
+        
+        Returns:
+            True if the server answered, else False (the reason is printed).
+        """
+        if self._alive:
+            return True
+        
+        print(f"\nChecking Ollama connection ({self.model_name})...")
+        try:
+            response = self.session.get(f"{self.ollama_url}/api/tags", timeout=(1, 5))
+        except requests.exceptions.RequestException:
+            print("Cannot connect to Ollama. Start it with: ollama serve")
+            return False
+        if response.status_code != 200:
+            print(f"Ollama returned status {response.status_code}")
+            return False
+        
+        print("Ollama server is running!")
+        self._alive = True
+        return True
+    
+    def _http_session(self) -> aiohttp.ClientSession:
+        """
+        Return the open aiohttp session, creating it on first use or if the event loop changed.
+        
+        Returns:
+            aiohttp session bound to the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.closed or self._http_loop is not loop:
+            connector = aiohttp.TCPConnector(limit=OLLAMA_CONNECTION_LIMIT)
+            self._http = aiohttp.ClientSession(connector=connector)
+            self._http_loop = loop
+        return self._http
+    
+    async def aclose(self):
+        """Close the aiohttp session; call it on the loop that ran the batches."""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+    
+    def build_prompt(self, text: str, timestamp: str) -> str:
+        """
+        Build the user message for one message; the instructions are in the system prompt.
+        
+        Args:
+            text: The raw message text.
+            timestamp: Posting timestamp.
+        
+        Returns:
+            User message content for the model.
+        """
+        return f"Text: {text}\nTimestamp: {timestamp}"
+    
+    def build_batch_prompt(self, items: List[Tuple[str, str]]) -> str:
+        """
+        Build one user message holding several numbered messages.
+        
+        Args:
+            items: (text, timestamp) pairs.
+        
+        Returns:
+            User message content for the model.
+        """
+        return "\n\n".join(
+            f"Message {n}:\nText: {text}\nTimestamp: {timestamp}" for n, (text, timestamp) in enumerate(items, 1)
+        )
+    
+    def build_request(self, text: str, timestamp: str) -> Dict:
+        """
+        Build the /api/chat request body for one message.
+        
+        Args:
+            text: The raw message text.
+            timestamp: Posting timestamp.
+        
+        Returns:
+            JSON-serializable request body.
+        """
+        return self._request_body(_SYSTEM_PROMPT, self.build_prompt(text, timestamp), OLLAMA_OPTIONS["num_predict"])
+    
+    def build_batch_request(self, items: List[Tuple[str, str]]) -> Dict:
+        """
+        Build the /api/chat request body for several messages, with room for every answer.
+        
+        Args:
+            items: (text, timestamp) pairs.
+        
+        Returns:
+            JSON-serializable request body.
+        """
+        return self._request_body(_BATCH_SYSTEM_PROMPT, self.build_batch_prompt(items),
+                                  OLLAMA_OPTIONS["num_predict"] * len(items))
+    
+    def _request_body(self, system: str, user: str, num_predict: int) -> Dict:
+        return {
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            "stream": False,
+            # Grammar-constrained decoding: the reply is always a single JSON object
+            "format": "json",
+            # Keep the model (and its cached system prompt) loaded between runs
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+            "options": dict(OLLAMA_OPTIONS, num_predict=num_predict),
+        }
+    
+    @staticmethod
+    def _decode_object(response_text: str) -> Tuple[Optional[Dict], str]:
+        """
+        Decode the first JSON object in a reply in place; a '{' in leading prose that does
+        not start valid JSON is skipped and the search moves on to the next one.
+        
+        Args:
+            response_text: Reply content returned by Ollama.
+        
+        Returns:
+            Tuple of (decoded object or None, error status when there is none).
+        """
+        # With format "json" the reply is normally just the object, which orjson decodes in one call
+        try:
+            decoded = orjson.loads(response_text)
+            if isinstance(decoded, dict):
+                return decoded, ""
+        except orjson.JSONDecodeError:
+            pass
+        
+        start_idx = response_text.find('{')
+        if start_idx < 0:
+            return None, "(No JSON)"
+        
+        while start_idx >= 0:
+            try:
+                decoded, _ = _JSON_DECODER.raw_decode(response_text, start_idx)
+                return decoded, ""
+            except json.JSONDecodeError:
+                start_idx = response_text.find('{', start_idx + 1)
+        
+        return None, "(JSON error)"
+    
+    @staticmethod
+    def _verdict(parsed: Dict) -> Tuple[Optional[Dict], str]:
+        # Check if valid
+        if not parsed.get('valid', False):
+            return None, STATUS_NOT_JOB
+        return parsed, STATUS_SUCCESS
+    
+    @staticmethod
+    def parse_response(response_text: str) -> Tuple[Optional[Dict], str]:
+        """
+        Pull the job JSON object out of the model's reply.
+        
+        Args:
+            response_text: Reply content returned by Ollama.
+        
+        Returns:
+            Tuple of (parsed dictionary if valid else None, short status for logging).
+        """
+        parsed, error = OllamaJobParser._decode_object(response_text)
+        if parsed is None:
+            return None, error
+        return OllamaJobParser._verdict(parsed)
+    
+    @staticmethod
+    def parse_batch_response(response_text: str, count: int) -> Optional[List[Tuple[Optional[Dict], str]]]:
+        """
+        Split a multi-message reply into one verdict per message.
+        
+        Args:
+            response_text: Reply content returned by Ollama.
+            count: Number of messages in the prompt.
+        
+        Returns:
+            (parsed dictionary if valid else None, status) per message in prompt order,
+            or None if the reply does not hold exactly one entry per message.
+        """
+        decoded, _ = OllamaJobParser._decode_object(response_text)
+        entries = decoded.get('results') if decoded is not None else None
+        if not isinstance(entries, list) or len(entries) != count:
+            return None
+        if not all(isinstance(entry, dict) for entry in entries):
+            return None
+        
+        # Trust the model's numbering when it is a permutation of 1..count, else the order
+        indexes = [entry.get('index') for entry in entries]
+        if sorted(i for i in indexes if isinstance(i, int)) == list(range(1, count + 1)):
+            entries = sorted(entries, key=lambda entry: entry['index'])
+        
+        return [OllamaJobParser._verdict({k: v for k, v in entry.items() if k != 'index'}) for entry in entries]
+    
+    @staticmethod
+    def _cache_entry(parsed: Optional[Dict], status: str) -> Optional[Dict]:
+        """
+        Decide what to remember for a model reply.
+        
+        Args:
+            parsed: Parsed job dictionary, or None.
+            status: Status returned with it.
+        
+        Returns:
+            Result to cache, or None for failures (timeouts, HTTP or JSON errors) worth retrying.
+        """
+        if parsed is not None:
+            return parsed
+        if status == STATUS_NOT_JOB:
+            return NOT_A_JOB
+        return None
+    
+    def _cache_key(self, text: str) -> str:
+        """Parse cache key for a message; it includes the model, since another model may answer differently."""
+        return make_text_hash(f"{self.model_name}\x00{text}")
+    
+    @staticmethod
+    def _from_cache(cached: Dict) -> Optional[Dict]:
+        """Turn a cached result back into parse_job_post's return value."""
+        return cached if cached.get('valid') else None
     
     def parse_job_post(self, text: str, timestamp: str, source: str) -> Optional[Dict]:
         """
@@ -34,47 +356,19 @@ class OllamaJobParser:
         Returns:
             Parsed dictionary if valid, else None.
         """
-        
-        prompt = f"""You are a job posting analyzer. Analyze the following text and determine if it is a valid job posting.
-
-RULES:
-1. Text MUST contain a job title/role
-2. Text MUST contain a company name
-3. Text MUST contain at least one of: location, job type (remote/hybrid/on-site), experience level, salary
-4. Ignore single-word messages, vague terms, or non-job content
-5. Return ONLY valid JSON, no markdown or comments
-6. If this is NOT a valid job posting, return exactly: {{"valid": false}}
-
-If valid, return this JSON structure:
-{{
-    "valid": true,
-    "role": "Job title",
-    "company_name": "Company name",
-    "location": "Location or 'Not specified'",
-    "experience_required": "Years/Level or null",
-    "job_type": "Remote/On-site/Hybrid or null",
-    "application_link": "URL or contact email or null",
-    "description": "Brief summary (2-3 sentences)"
-}}
-
-Text: {text}
-Timestamp: {timestamp}
-
-Respond ONLY with the JSON object, nothing else."""
+        text_hash = self._cache_key(text)
+        if self.cache is not None:
+            cached = self.cache.get_cached_parses([text_hash]).get(text_hash)
+            if cached is not None:
+                print("   Cached result")
+                return self._from_cache(cached)
         
         try:
             print(f"   Parsing with {self.model_name}...", end=" ", flush=True)
             
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
-                json={
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "stream": False,
-                    "temperature": 0.1,
-                    "top_p": 0.9,
-                    "num_predict": 300,
-                },
+            response = self.session.post(
+                f"{self.ollama_url}/api/chat",
+                json=self.build_request(text, timestamp),
                 timeout=60
             )
             
@@ -82,39 +376,217 @@ Respond ONLY with the JSON object, nothing else."""
                 print(f"(HTTP {response.status_code})")
                 return None
             
-            result = response.json()
-            response_text = result.get("response", "").strip()
+            # orjson straight from the body bytes, skipping requests' charset detection and text decode
+            result = orjson.loads(response.content)
+            parsed, status = self.parse_response(result.get("message", {}).get("content", ""))
+            print(status)
             
-            # Extract JSON
-            try:
-                start_idx = response_text.find('{')
-                end_idx = response_text.rfind('}') + 1
-                
-                if start_idx < 0 or end_idx <= start_idx:
-                    print("(No JSON)")
-                    return None
-                
-                json_str = response_text[start_idx:end_idx]
-                parsed = json.loads(json_str)
-                
-                # Check if valid
-                if not parsed.get('valid', False):
-                    print("(Not a job posting)")
-                    return None
-                
-                print("Success")
-                return parsed
-                
-            except json.JSONDecodeError as e:
-                print("(JSON error)")
-                return None
+            entry = self._cache_entry(parsed, status)
+            if self.cache is not None and entry is not None:
+                self.cache.cache_parses([(text_hash, entry)])
+            return parsed
         
         except requests.exceptions.Timeout:
             print("(Timeout)")
             return None
         except requests.exceptions.ConnectionError:
-            print("(Ollama not running)")
+            self._alive = False
+            print(STATUS_UNREACHABLE)
             return None
         except Exception as e:
             print(f"(Error: {str(e)[:30]})")
-            return None
\ No newline at end of file
+            return None
+    
+    async def _chat(self, session: aiohttp.ClientSession, body: Dict,
+                    timeout: float = 60) -> Tuple[Optional[str], str]:
+        """
+        POST one /api/chat request.
+        
+        Args:
+            session: Open aiohttp session.
+            body: Request body.
+            timeout: Seconds allowed for the whole request.
+        
+        Returns:
+            Tuple of (model reply text or None, error status when the request failed).
+        """
+        for attempt in range(_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(_RETRY_BACKOFF * 2 ** (attempt - 1))
+            retry = attempt < _RETRIES
+            try:
+                async with session.post(f"{self.ollama_url}/api/chat", json=body,
+                                        timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    if response.status in _RETRY_STATUSES and retry:
+                        continue
+                    if response.status != 200:
+                        return None, f"(HTTP {response.status})"
+                    result = orjson.loads(await response.read())
+                return result.get("message", {}).get("content", ""), ""
+            except asyncio.TimeoutError:
+                return None, "(Timeout)"
+            except aiohttp.ClientConnectorError:
+                # Never reached the server, so nothing was generated; same as the connect retries above
+                if retry:
+                    continue
+                return None, STATUS_UNREACHABLE
+            except aiohttp.ClientConnectionError:
+                return None, STATUS_UNREACHABLE
+            except Exception as e:
+                return None, f"(Error: {str(e)[:30]})"
+    
+    async def _parse_one(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                         text: str, timestamp: str) -> Tuple[Optional[Dict], str]:
+        """
+        Send one message to Ollama once a concurrency slot is free.
+        
+        Args:
+            session: Open aiohttp session.
+            semaphore: Limits the number of requests in flight.
+            text: The raw message text.
+            timestamp: Posting timestamp.
+        
+        Returns:
+            Tuple of (parsed dictionary if valid else None, short status for logging).
+        """
+        async with semaphore:
+            reply, error = await self._chat(session, self.build_request(text, timestamp))
+        if reply is None:
+            return None, error
+        return self.parse_response(reply)
+    
+    async def _parse_group(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                           items: List[Tuple[str, str]]) -> List[Tuple[Optional[Dict], str]]:
+        """
+        Send several messages to Ollama in one prompt, so the instructions are processed once
+        for the whole group. Falls back to one request per message if the reply does not split
+        cleanly into one answer per message; a request that got no reply (Ollama unreachable,
+        timed out or erroring) fails the whole group instead, as retrying per message would only
+        add load to a server that is already down or overloaded.
+        
+        Args:
+            session: Open aiohttp session.
+            semaphore: Limits the number of requests in flight.
+            items: (text, timestamp) pairs.
+        
+        Returns:
+            (parsed dictionary if valid else None, status) per message, in order.
+        """
+        if len(items) == 1:
+            return [await self._parse_one(session, semaphore, *items[0])]
+        
+        async with semaphore:
+            # Every answer is generated in this one request, so it gets a longer timeout
+            reply, error = await self._chat(session, self.build_batch_request(items), timeout=60 * len(items))
+        if reply is None:
+            return [(None, error)] * len(items)
+        verdicts = self.parse_batch_response(reply, len(items))
+        if verdicts is not None:
+            return verdicts
+        
+        # The semaphore is released first, so the per-message retries can take their own slots
+        return list(await asyncio.gather(*(self._parse_one(session, semaphore, *item) for item in items)))
+    
+    async def parse_job_post_async(self, text: str, timestamp: str, source: str) -> Optional[Dict]:
+        """
+        Async counterpart of parse_job_post; run many with asyncio.gather to keep several
+        requests in flight, or use parse_job_posts_batch to also bound and group them.
+        
+        Args:
+            text: The raw message text.
+            timestamp: Posting timestamp.
+            source: Source name.
+        
+        Returns:
+            Parsed dictionary if valid, else None.
+        """
+        results = await self.parse_batch_results([{'text': text, 'timestamp': timestamp}])
+        return results[0][0]
+    
+    async def parse_job_posts_batch(self, messages: List[Dict],
+                                    concurrency: int = OLLAMA_CONCURRENCY) -> List[Optional[Dict]]:
+        """
+        Parse many messages with several requests in flight, since Ollama serves a loaded
+        model to concurrent requests and the client would otherwise sit idle on each reply.
+        
+        Args:
+            messages: Message dictionaries with 'text' and 'timestamp' keys.
+            concurrency: Maximum number of simultaneous requests.
+        
+        Returns:
+            Parsed dictionaries (or None for non-jobs and failures), in message order.
+        """
+        return [parsed for parsed, _ in await self.parse_batch_results(messages, concurrency)]
+    
+    async def parse_batch_results(self, messages: List[Dict],
+                                  concurrency: int = OLLAMA_CONCURRENCY) -> List[Tuple[Optional[Dict], bool]]:
+        """
+        Like parse_job_posts_batch, but also report which messages got a definite answer.
+        
+        Args:
+            messages: Message dictionaries with 'text' and 'timestamp' keys.
+            concurrency: Maximum number of simultaneous requests.
+        
+        Returns:
+            (parsed dictionary or None, settled) per message, in message order; settled is False
+            when the request failed (timeout, HTTP or JSON error) and is worth retrying.
+        """
+        if not messages:
+            return []
+        
+        hashes = [self._cache_key(msg.get('text', '')) for msg in messages]
+        cached = self.cache.get_cached_parses(hashes) if self.cache is not None else {}
+        # One request per distinct uncached text; repeats share its answer
+        first_index: Dict[str, int] = {}
+        for i, text_hash in enumerate(hashes):
+            if text_hash not in cached:
+                first_index.setdefault(text_hash, i)
+        pending = list(first_index.values())
+        hits = sum(1 for text_hash in hashes if text_hash in cached)
+        if hits:
+            print(f"   {hits} messages answered from the parse cache")
+        
+        results: List[Tuple[Optional[Dict], bool]] = [(None, False)] * len(messages)
+        for i, text_hash in enumerate(hashes):
+            if text_hash in cached:
+                results[i] = (self._from_cache(cached[text_hash]), True)
+        
+        if not pending:
+            return results
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        groups = [pending[i:i + OLLAMA_PROMPT_BATCH_SIZE] for i in range(0, len(pending), OLLAMA_PROMPT_BATCH_SIZE)]
+        print(f"   Parsing {len(pending)} messages with {self.model_name} "
+              f"({OLLAMA_PROMPT_BATCH_SIZE} per prompt, {concurrency} prompts at a time)...")
+        
+        session = self._http_session()
+        group_replies = await asyncio.gather(*(
+            self._parse_group(session, semaphore, [
+                (messages[i].get('text', ''), messages[i].get('timestamp', '')) for i in group
+            ])
+            for group in groups
+        ))
+        replies = [reply for group_reply in group_replies for reply in group_reply]
+        if any(status == STATUS_UNREACHABLE for _, status in replies):
+            self._alive = False
+        
+        answers: Dict[str, Tuple[Optional[Dict], bool]] = {}
+        new_entries = []
+        # Progress is written once per batch; a print per message costs a stdout write each on a terminal
+        progress = []
+        for idx, (i, (parsed, status)) in enumerate(zip(pending, replies), 1):
+            progress.append(f"[{idx}/{len(pending)}] {status}: {messages[i].get('text', '')[:60]}...")
+            entry = self._cache_entry(parsed, status)
+            answers[hashes[i]] = (parsed, entry is not None)
+            if entry is not None:
+                new_entries.append((hashes[i], entry))
+        print("\n".join(progress))
+        
+        for i, text_hash in enumerate(hashes):
+            if text_hash in answers:
+                results[i] = answers[text_hash]
+        
+        if self.cache is not None:
+            self.cache.cache_parses(new_entries)
+        
+        return results
@@ -8,12 +8,25 @@ across worker processes/nodes in a multi-threaded or distributed scraping setup.
 
 import re
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Optional
+import ciso8601
 from dateutil import parser as dateparser
+import xxhash
 
+# Compiled once; parse_pre_plain runs for every scraped message
+_QUOTE_PREFIX_RE = re.compile(r'^(?:&gt;|>)+\s*')
+_NEWLINES_RE = re.compile(r'[\r\n]+')
+_BRACKET_SENDER_RE = re.compile(r'^\s*\[(?P<ts>[^\]]+)\]\s*(?P<sender>[^:]+):?\s*$')
+_BRACKET_TS_RE = re.compile(r'^\s*\[(?P<ts>[^\]]+)\]')
+_CLOCK_TIME_RE = re.compile(r'^(?P<ts>\d{1,2}[:.]\d{2}(?:\s*(?:AM|PM|am|pm))?)')
+
+@lru_cache(maxsize=4096)
 def try_parse_datetime(dt_str: str) -> Optional[str]:
     """
     Parse a datetime string to ISO format.
+    Results are memoized: timestamps repeat heavily within a chat and dateutil parsing is slow.
+    ISO 8601 timestamps are parsed by ciso8601 (C) first; anything else falls back to dateutil.
     
     Args:
         dt_str: The datetime string to parse.
@@ -26,6 +39,13 @@ def try_parse_datetime(dt_str: str) -> Optional[str]:
     
     s = dt_str.strip().replace('\u200e', '').replace('\u200f', '')
     
+    # Only strings starting with a full YYYY-MM-DD date, so partial dates keep dateutil's defaults
+    if len(s) >= 10 and s[4] == '-' and s[:4].isdigit():
+        try:
+            return ciso8601.parse_datetime(s).isoformat()
+        except ValueError:
+            pass
+    
     for dayfirst in (False, True):
         try:
             dt = dateparser.parse(s, dayfirst=dayfirst, fuzzy=True)
@@ -49,8 +69,8 @@ def clean_pre_plain(raw: str) -> Optional[str]:
     if raw is None:
         return None
     s = raw.strip()
-    s = re.sub(r'^(?:&gt;|>)+\s*', '', s)
-    s = re.sub(r'[\r\n]+', ' ', s).strip()
+    s = _QUOTE_PREFIX_RE.sub('', s)
+    s = _NEWLINES_RE.sub(' ', s).strip()
     return s
 
 def parse_pre_plain(pre_raw: str) -> Dict:
@@ -70,21 +90,49 @@ def parse_pre_plain(pre_raw: str) -> Dict:
     s = clean_pre_plain(pre_raw)
     
     # Format: [timestamp] sender:
-    m = re.match(r'^\s*\[(?P<ts>[^\]]+)\]\s*(?P<sender>[^:]+):?\s*$', s)
+    m = _BRACKET_SENDER_RE.match(s)
     if m:
         out['ts_str'] = m.group('ts').strip()
         return out
     
     # Format: [timestamp]
-    m2 = re.match(r'^\s*\[(?P<ts>[^\]]+)\]', s)
+    m2 = _BRACKET_TS_RE.match(s)
     if m2:
         out['ts_str'] = m2.group('ts').strip()
         return out
     
     # Format: HH:MM AM/PM
-    m3 = re.match(r'^(?P<ts>\d{1,2}[:.]\d{2}(?:\s*(?:AM|PM|am|pm))?)', s)
+    m3 = _CLOCK_TIME_RE.match(s)
     if m3:
         out['ts_str'] = m3.group('ts').strip()
         return out
     
-    return out
\ No newline at end of file
+    return out
+
+def make_post_id(company_name: str, role: str, date_posted: str) -> str:
+    """
+    Build the deduplication key for a job post.
+    Uses the non-cryptographic 128-bit XXH3 hash, which is much faster than MD5 on short keys
+    and keeps collisions negligible however many posts accumulate.
+    
+    Args:
+        company_name: Company name as stored.
+        role: Job title as stored.
+        date_posted: Posting timestamp.
+    
+    Returns:
+        32-character hex digest.
+    """
+    return xxhash.xxh3_128_hexdigest(f"{company_name}{role}{date_posted}".encode())
+
+def make_text_hash(text: str) -> str:
+    """
+    Build the parse cache key for a message's text.
+    
+    Args:
+        text: Raw message text.
+    
+    Returns:
+        16-character hex digest.
+    """
+    return xxhash.xxh3_64_hexdigest(text.encode())